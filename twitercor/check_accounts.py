@@ -1,16 +1,18 @@
 #!/usr/bin/env python3
 import asyncio
+import sys
 from twscrape import API
 
 async def check_accounts():
     api = API()
     accounts = await api.pool.accounts_info()
-    print('Статус акаунтів:')
-    for acc in accounts:
-        status = 'Активний' if acc['active'] else 'Неактивний'
-        error = acc.get('error_msg', 'OK')
-        username = acc['username']
-        print(f'  {username}: {status} - {error}')
+    # Збираємо весь вивід і пишемо одним викликом
+    lines = ['Статус акаунтів:\n']
+    lines.extend(
+        f"  {acc['username']}: {'Активний' if acc['active'] else 'Неактивний'} - {acc.get('error_msg', 'OK')}\n"
+        for acc in accounts
+    )
+    sys.stdout.writelines(lines)
 
 if __name__ == "__main__":
     asyncio.run(check_accounts())
\ No newline at end of file
@@ -6,17 +6,91 @@ Fast Twitter Actions API - з зменшеними затримками
 """
 
 import asyncio
+import heapq
+import importlib.util
 import json
+import os
 import random
 import httpx
 import time
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 
+try:
+    import orjson
+except ImportError:  # orjson - необов'язкове прискорення, є запасний варіант на json
+    orjson = None
+
 from twscrape.accounts_pool import AccountsPool
 from twscrape.account import TOKEN
+from twscrape.db import execute, executemany, fetchall
 from twscrape.api import GQL_FEATURES
-from twitter_actions import TwitterActionsAPI, GRAPHQL_OPERATIONS
+from throttling import RETRYABLE_STATUS, RateLimiter
+from twitter_actions import TwitterActionsAPI, GRAPHQL_OPERATIONS, GQL_URL
+
+# Як часто (секунди) перечитуємо список активних акаунтів з пулу
+HEAP_REFRESH_INTERVAL = 30.0
+# Скільки запитів поспіль акаунт може зробити до однієї операції без очікування
+BUCKET_BURST = 3
+# Повтори на 429/5xx
+MAX_RETRIES = 5
+MAX_RETRY_DELAY = 32.0
+# Пул з'єднань спільного клієнта
+MAX_CONNECTIONS = 64
+MAX_KEEPALIVE = 32
+# Воркери черги запитів і максимальний розмір пакета операцій одного акаунта
+SUBMIT_WORKERS = 16
+MAX_BATCH = 8
+# Статуси, якими сервер однозначно відхиляє масив операцій (нічого не виконавши)
+BATCH_REJECTED_STATUS = frozenset({400, 404})
+# Скільки секунд пам'ятаємо виконаний лайк/ретвіт, щоб не повторювати його
+IDEMPOTENCY_TTL = 300.0
+IDEMPOTENCY_MAX_ENTRIES = 10000
+# Стан затримок і бакетів акаунтів зберігаємо в SQLite пулу кожні N виборів акаунта
+STATE_FLUSH_EVERY = 50
+_STATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS account_state (
+    username TEXT PRIMARY KEY NOT NULL COLLATE NOCASE,
+    last_request REAL NOT NULL,
+    tokens REAL NOT NULL,
+    blocked_until REAL NOT NULL
+)
+"""
+# Операції, що встановлюють стан твіта, і протилежні до них
+_INVERSE_OPERATIONS = {
+    "FavoriteTweet": "UnfavoriteTweet",
+    "UnfavoriteTweet": "FavoriteTweet",
+    "CreateRetweet": "DeleteRetweet",
+    "DeleteRetweet": "CreateRetweet",
+}
+# Готові URL операцій, щоб не форматувати рядок на кожен запит
+_OP_URLS = {op: f"https://x.com/i/api/graphql/{qid}" for op, qid in GRAPHQL_OPERATIONS.items()}
+# HTTP/2 мультиплексує запити в одному з'єднанні, якщо встановлено пакет h2
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def _dumps(obj) -> bytes:
+    """Compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def _loads(raw: bytes):
+    """Parse JSON bytes."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+# Прапорці features однакові для всіх запитів - серіалізуємо їх один раз
+_FEATURES_JSON = _dumps(GQL_FEATURES)
+
+
+def _operation_body(variables: Dict, query_id: str = None) -> bytes:
+    """JSON body of one GraphQL operation with the pre-encoded features."""
+    head = b'{"queryId":' + _dumps(query_id) + b',' if query_id else b'{'
+    return head + b'"variables":' + _dumps(variables) + b',"features":' + _FEATURES_JSON + b'}'
 
 
 class FastTwitterActionsAPI:
@@ -24,65 +98,204 @@ class FastTwitterActionsAPI:
     Швидка версія TwitterActionsAPI з власним управлінням затримками
     """
     
-    def __init__(self, pool: AccountsPool, debug: bool = False, proxy: str = None):
+    def __init__(self, pool: AccountsPool, debug: bool = False, proxy: str = None,
+                 account_proxies: Optional[Dict[str, str]] = None):
         self.pool = pool
         self.debug = debug
         self.proxy = proxy
-        # Власна система затримок - зберігаємо час останнього запиту для кожного акаунта
+        # username -> проксі (як у proxies.json)
+        self.account_proxies = account_proxies or {}
+        # Власна система затримок - час (time.monotonic) останнього запиту кожного акаунта
         self.account_last_request = {}
-        # Мінімальна затримка між запитами (секунди)
+        # Мінімальна затримка між запитами (секунди) - базова швидкість токен-бакетів
         self.min_delay = 3  # 3 секунди замість 120
+        # Twitter рахує ліміти окремо для кожного endpoint, тож бакет на (акаунт, операцію)
+        self.buckets: Dict[Tuple[str, str], RateLimiter] = {}
+        # Купа (час готовності, username) - на вершині акаунт, що звільниться найраніше
+        self._heap = []
+        # Коли купу востаннє збирали з пулу; None - треба зібрати
+        self._heap_built_at = None
+        # username -> Account з останнього оновлення купи
+        self._accounts = {}
+        # Клієнт на кожен проксі: DNS/TCP/TLS робимо раз, далі keep-alive
+        self._clients: Dict[Optional[str], httpx.AsyncClient] = {}
+        self._client_loop = None
+        # username -> (ct0, готові заголовки); httpx не змінює переданий словник
+        self._header_cache: Dict[str, Tuple[str, Dict[str, str]]] = {}
+        # (операція, tweet_id, username) -> (коли виконано, відповідь)
+        self._idempotency: Dict[Tuple[str, str, str], Tuple[float, dict]] = {}
+        # None - ще не перевіряли, чи приймає сервер пакет операцій
+        self._batch_supported = None
+        # Черга (операція, змінні, future) і воркери, що збирають її в пакети
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._queue_loop = None
+        # username -> (tokens, blocked_until, last_request) з БД для ще не створених бакетів
+        self._saved_state: Optional[Dict[str, Tuple[float, float, float]]] = None
+        self._dirty_accounts = set()
+        self._unsaved = 0
+    
+    async def _load_state(self):
+        """Read last-request times and bucket state saved by a previous run."""
+        self._saved_state = {}
+        try:
+            # Лише власна таблиця: режим журналу БД пулу належить twscrape, його не чіпаємо
+            await execute(self.pool._db_file, _STATE_TABLE_SQL)
+            rows = await fetchall(self.pool._db_file, "SELECT username, last_request, tokens, blocked_until FROM account_state")
+        except Exception as e:
+            print(f"⚠️ Could not load account state: {e}")
+            return
+        
+        # У БД час настінний, у пам'яті - monotonic
+        offset = time.time() - time.monotonic()
+        for username, last_request, tokens, blocked_until in rows:
+            self.account_last_request.setdefault(username, last_request - offset)
+            self._saved_state[username] = (tokens, blocked_until, last_request)
+    
+    async def save_state(self):
+        """Write last-request times and bucket state of recently used accounts to the pool DB."""
+        dirty, self._dirty_accounts = self._dirty_accounts, set()
+        self._unsaved = 0
+        if not dirty:
+            return
+        
+        offset = time.time() - time.monotonic()
+        tokens: Dict[str, float] = {}
+        blocked: Dict[str, float] = {}
+        for (username, _), bucket in self.buckets.items():
+            if username in dirty:
+                bucket_tokens, bucket_blocked = bucket.state()
+                tokens[username] = min(tokens.get(username, bucket_tokens), bucket_tokens)
+                blocked[username] = max(blocked.get(username, 0.0), bucket_blocked)
+        
+        rows = [{
+            "username": username,
+            "last_request": self.account_last_request[username] + offset,
+            "tokens": tokens.get(username, float(BUCKET_BURST)),
+            "blocked_until": blocked.get(username, 0.0),
+        } for username in dirty if username in self.account_last_request]
+        try:
+            await executemany(
+                self.pool._db_file,
+                "INSERT OR REPLACE INTO account_state VALUES (:username, :last_request, :tokens, :blocked_until)",
+                rows,
+            )
+        except Exception as e:
+            print(f"⚠️ Could not save account state: {e}")
+            self._dirty_accounts |= dirty
+    
+    async def _refresh_heap(self):
+        """Rebuild the account heap from the pool's active accounts."""
+        if self._saved_state is None:
+            await self._load_state()
+        # Один запит до SQLite дає і список, і повні об'єкти акаунтів
+        accounts = [acc for acc in await self.pool.get_all() if acc.active]
+        self._accounts = {acc.username: acc for acc in accounts}
+        last_request = self.account_last_request
+        min_delay = self.min_delay
+        self._heap = [(last_request.get(acc.username, 0.0) + min_delay, acc.username) for acc in accounts]
+        heapq.heapify(self._heap)
+        self._heap_built_at = time.monotonic()
+    
+    def invalidate_accounts_cache(self):
+        """Re-read the account list from the pool on the next pick (after login/add/delete)."""
+        self._heap_built_at = None
         
     async def _get_account_with_minimal_delay(self, queue_name: str = "FavoriteTweet"):
         """Отримати акаунт з мінімальною затримкою"""
-        accounts_info = await self.pool.accounts_info()
-        active_accounts = [acc for acc in accounts_info if acc["active"]]
+        # Monotonic-час не стрибає при зміні системного годинника
+        now = time.monotonic()
+        # Список акаунтів рідко змінюється - не звертаємось до SQLite на кожну дію,
+        # навіть коли активних акаунтів немає
+        if self._heap_built_at is None or now - self._heap_built_at > HEAP_REFRESH_INTERVAL:
+            await self._refresh_heap()
         
-        if not active_accounts:
+        if not self._heap:
             return None
-            
-        # Знайдемо акаунт, який найдавніше використовувався
-        best_account = None
-        best_wait_time = float('inf')
-        
-        current_time = time.time()
         
-        for acc_info in active_accounts:
-            username = acc_info["username"]
-            last_request_time = self.account_last_request.get(username, 0)
-            wait_time = max(0, self.min_delay - (current_time - last_request_time))
-            
-            if wait_time < best_wait_time:
-                best_wait_time = wait_time
-                best_account = username
+        # Купа лише впорядковує акаунти (найдавніше використаний - першим),
+        # а чекає за потреби токен-бакет акаунта в _make_direct_request
+        ready_at, username = heapq.heappop(self._heap)
+        heapq.heappush(self._heap, (max(ready_at, now) + self.min_delay, username))
+        self.account_last_request[username] = now
+        self._dirty_accounts.add(username)
+        self._unsaved += 1
+        if self._unsaved >= STATE_FLUSH_EVERY:
+            await self.save_state()
+        return self._accounts[username]
+    
+    def _bucket(self, username: str, operation: str) -> RateLimiter:
+        """Token bucket for the account's requests to one GraphQL operation."""
+        key = (username, operation)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = RateLimiter(rate=1 / self.min_delay, burst=BUCKET_BURST)
+            saved = (self._saved_state or {}).get(username)
+            if saved is not None:
+                # Після перезапуску акаунт не отримує повний бакет одразу
+                bucket.restore(*saved)
+        return bucket
+    
+    def _account_proxy(self, account) -> Optional[str]:
+        """Proxy for the account: proxies.json entry, API proxy, TWS_PROXY, then the account's own."""
+        candidates = [self.account_proxies.get(account.username), self.proxy,
+                      os.getenv("TWS_PROXY"), account.proxy]
+        return next((p for p in candidates if p), None)
+    
+    def _get_client(self, proxy: Optional[str] = None) -> httpx.AsyncClient:
+        """Pooled HTTP client for the proxy (None - direct), created on first use in the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._client_loop is not loop:
+            # Клієнти прив'язані до event loop, у якому створені
+            self._clients = {}
+            self._client_loop = loop
         
-        if best_account and best_wait_time > 0:
-            if self.debug:
-                print(f"Waiting {best_wait_time:.1f}s for account {best_account}")
-            await asyncio.sleep(best_wait_time)
+        client = self._clients.get(proxy)
+        if client is None:
+            # Окремий пул з'єднань на кожен проксі - запити розходяться по різних IP
+            client = self._clients[proxy] = httpx.AsyncClient(
+                proxy=proxy,
+                http2=_HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_connections=MAX_CONNECTIONS,
+                                    max_keepalive_connections=MAX_KEEPALIVE),
+                timeout=30.0,
+            )
+        return client
+    
+    async def aclose(self):
+        """Stop the submit workers, save account state and close all pooled HTTP clients."""
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        queue, self._queue = self._queue, None
+        # Операції, які воркери ще не взяли, теж скасовуємо - інакше _submit() чекатиме вічно
+        while queue is not None and not queue.empty():
+            _, _, future = queue.get_nowait()
+            future.cancel()
         
-        # Отримуємо повний об'єкт акаунта
-        account = await self.pool.get(best_account)
-        if account:
-            self.account_last_request[best_account] = time.time()
+        await self.save_state()
         
-        return account
+        clients, self._clients = self._clients, {}
+        self._client_loop = None
+        for client in clients.values():
+            try:
+                await client.aclose()
+            except Exception:
+                pass
     
-    async def _make_direct_request(self, operation: str, variables: Dict, account = None):
-        """Виконати прямий GraphQL запит без обмежень twscrape"""
-        if not account:
-            account = await self._get_account_with_minimal_delay()
-            
-        if not account:
-            return None
-            
-        url = f"https://x.com/i/api/graphql/{GRAPHQL_OPERATIONS[operation]}"
-        
+    def _headers(self, account) -> Dict[str, str]:
+        """Request headers authenticating as the account, built once per session cookie."""
         # Отримуємо CSRF токен з cookies
         csrf_token = account.cookies.get('ct0', '')
         
+        cached = self._header_cache.get(account.username)
+        # Новий ct0 означає перелогін - заголовки треба зібрати заново
+        if cached is not None and cached[0] == csrf_token:
+            return cached[1]
+        
         # Перетворюємо cookies словник в строку
-        cookie_string = "; ".join([f"{k}={v}" for k, v in account.cookies.items()])
+        cookie_string = "; ".join(map("=".join, account.cookies.items()))
         
         headers = {
             "Authorization": f"Bearer {TOKEN}",
@@ -91,54 +304,260 @@ class FastTwitterActionsAPI:
             "Cookie": cookie_string,
             "User-Agent": account.user_agent,
         }
+        self._header_cache[account.username] = (csrf_token, headers)
+        return headers
+    
+    def invalidate_headers(self, username: str = None):
+        """Forget cached headers of one account, or of all accounts."""
+        if username is None:
+            self._header_cache.clear()
+        else:
+            self._header_cache.pop(username, None)
+    
+    @staticmethod
+    def _idempotency_key(operation: str, variables: Dict, account) -> Optional[Tuple[str, str, str]]:
+        """Cache key of a state-setting operation, None for operations that are not idempotent."""
+        if operation not in _INVERSE_OPERATIONS:
+            return None
+        tweet_id = variables.get("tweet_id") or variables.get("source_tweet_id")
+        return (operation, str(tweet_id), account.username)
+    
+    def _remember(self, key: Tuple[str, str, str], result: dict):
+        """Store a successful result and forget the opposite operation on the same tweet."""
+        operation, tweet_id, username = key
+        now = time.monotonic()
+        if len(self._idempotency) >= IDEMPOTENCY_MAX_ENTRIES:
+            # Чистимо прострочені записи, щоб кеш не ріс безмежно за довгу сесію
+            self._idempotency = {k: v for k, v in self._idempotency.items() if now - v[0] < IDEMPOTENCY_TTL}
+        self._idempotency[key] = (now, result)
+        # Після unlike лайк знову має піти на сервер
+        self._idempotency.pop((_INVERSE_OPERATIONS[operation], tweet_id, username), None)
+    
+    def _recalled(self, key: Optional[Tuple[str, str, str]]) -> Optional[dict]:
+        """Result of the same operation done recently, None if it has to be sent."""
+        if key is None:
+            return None
+        hit = self._idempotency.get(key)
+        if hit is None or time.monotonic() - hit[0] >= IDEMPOTENCY_TTL:
+            return None
+        if self.debug:
+            print(f"♻️ {key[0]} already done by {key[2]}, skipping")
+        return hit[1]
+    
+    async def _make_direct_request(self, operation: str, variables: Dict, account = None):
+        """Виконати прямий GraphQL запит без обмежень twscrape"""
+        if not account:
+            account = await self._get_account_with_minimal_delay()
+            
+        if not account:
+            return None
         
-        data = {
-            "variables": variables,
-            "features": GQL_FEATURES,
-        }
+        # Повторний лайк/ретвіт того ж твіта тим самим акаунтом нічого не змінить - не шлемо запит
+        key = self._idempotency_key(operation, variables, account)
+        cached = self._recalled(key)
+        if cached is not None:
+            return cached
+            
+        url = _OP_URLS[operation]
         
-        # Тимчасово відключаємо проксі для тестування, щоб система працювала
-        # TODO: Додати підтримку проксі для httpx 0.28.1
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.post(url, headers=headers, json=data)
+        headers = self._headers(account)
+        
+        body = _operation_body(variables)
+        
+        bucket = self._bucket(account.username, operation)
+        client = self._get_client(self._account_proxy(account))
+        try:
+            for attempt in range(MAX_RETRIES):
+                async with bucket:
+                    response = await client.post(url, headers=headers, content=body)
+                # x-rate-limit-* заголовки підлаштовують швидкість бакета під ліміти Twitter
+                bucket.update_from_headers(response.headers)
                 
                 if self.debug:
                     print(f"🔗 Request to {operation}: {response.status_code}")
-                    
+                
                 if response.status_code == 200:
-                    result = response.json()
+                    result = _loads(response.content)
+                    if key is not None:
+                        self._remember(key, result)
                     return result
-                else:
+                
+                if response.status_code not in RETRYABLE_STATUS or attempt == MAX_RETRIES - 1:
                     print(f"❌ Request failed: {response.status_code} - {response.text}")
                     return None
-                    
+                
+                delay = self._retry_delay(response, attempt)
+                if self.debug:
+                    print(f"⏳ {response.status_code} on {operation}, retry in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                
+        except Exception as e:
+            print(f"❌ Request error: {e}")
+            return None
+    
+    @staticmethod
+    def _retry_delay(response, attempt: int) -> float:
+        """Seconds to wait before retrying a 429/5xx response."""
+        if response.status_code == 429:
+            # Сервер сам каже, скільки чекати
+            try:
+                return float(response.headers["retry-after"])
+            except (KeyError, ValueError):
+                pass
+            try:
+                return max(0.0, float(response.headers["x-rate-limit-reset"]) - time.time())
+            except (KeyError, ValueError):
+                pass
+        # Експоненційна пауза з випадковою добавкою, щоб паралельні запити не повторювались разом
+        return min(MAX_RETRY_DELAY, 2 ** attempt) + random.uniform(0, 0.5)
+    
+    async def _batch_request(self, ops: List[Tuple[str, Dict]], account=None) -> List[Optional[dict]]:
+        """Run several GraphQL operations as one account, one result per operation."""
+        if not account:
+            account = await self._get_account_with_minimal_delay()
+        if not account:
+            return [None] * len(ops)
+        
+        # Уже виконані лайки/ретвіти в пакет не потрапляють, як і в _make_direct_request
+        keys = [self._idempotency_key(op, variables, account) for op, variables in ops]
+        results = [self._recalled(key) for key in keys]
+        pending = [i for i, result in enumerate(results) if result is None]
+        
+        if len(pending) > 1 and self._batch_supported is not False:
+            batch = await self._post_batch([ops[i] for i in pending], account)
+            if batch is not None:
+                for i, result in zip(pending, batch):
+                    results[i] = result
+                    if result is not None and keys[i] is not None:
+                        self._remember(keys[i], result)
+                return results
+            # Сервер не приймає масив операцій - далі одразу шлемо по одній
+            self._batch_supported = False
+        
+        for i in pending:
+            op, variables = ops[i]
+            results[i] = await self._make_direct_request(op, variables, account)
+        return results
+    
+    async def _post_batch(self, ops: List[Tuple[str, Dict]], account) -> Optional[List[Optional[dict]]]:
+        """POST the operations as one JSON array, None only if the server rejected the array outright."""
+        failed = [None] * len(ops)
+        body = b"[" + b",".join(
+            _operation_body(variables, GRAPHQL_OPERATIONS[op].split("/")[0]) for op, variables in ops
+        ) + b"]"
+        
+        try:
+            for op, _ in ops:
+                await self._bucket(account.username, op).acquire()
+            response = await self._get_client(self._account_proxy(account)).post(GQL_URL, headers=self._headers(account), content=body)
+        except Exception as e:
+            # Таймаут чи помилка проксі: сервер міг уже виконати дії, тож повторно їх не шлемо
+            if self.debug:
+                print(f"❌ Batch request error: {e}")
+            return failed
+        
+        if self.debug:
+            print(f"🔗 Batch of {len(ops)} operations: {response.status_code}")
+        
+        if response.status_code in BATCH_REJECTED_STATUS:
+            return None  # Масив не прийнято - нічого не виконано, можна слати по одній
+        if response.status_code != 200:
+            # 429/5xx - тимчасова проблема, пакетний режим лишається увімкненим
+            return failed
+        
+        # Після 200 дії могли виконатись - навіть незрозумілу відповідь не повторюємо
+        try:
+            result = _loads(response.content)
+        except ValueError:
+            result = None
+        if not isinstance(result, list):
+            # Сервер відповів на масив не масивом - далі шлемо операції по одній
+            self._batch_supported = False
+            return failed
+        self._batch_supported = True
+        if len(result) != len(ops):
+            return failed
+        # Відповіді йдуть у порядку операцій; помилка операції = None
+        return [item if isinstance(item, dict) and not item.get("errors") else None
+                for item in result]
+    
+    async def _submit(self, operation: str, variables: Dict) -> Optional[dict]:
+        """Queue an operation for the workers and wait for its result."""
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._queue_loop is not loop:
+            # Воркери живуть у event loop, де їх запустили
+            self._queue = asyncio.Queue()
+            self._queue_loop = loop
+            self._workers = [loop.create_task(self._worker()) for _ in range(SUBMIT_WORKERS)]
+        
+        future = loop.create_future()
+        self._queue.put_nowait((operation, variables, future))
+        return await future
+    
+    async def _worker(self):
+        """Take queued operations and send whatever has piled up as one batch."""
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            # Без навантаження запит іде одразу; якщо черга накопичилась - забираємо пакет.
+            # Коли сервер не приймає пакети, краще розкидати операції по різних акаунтах
+            if self._batch_supported is not False:
+                seen = {(batch[0][0], str(batch[0][1]))}
+                deferred = []
+                while len(batch) < MAX_BATCH:
+                    try:
+                        item = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+                    # Одна й та сама дія над тим самим твітом в пакеті одного акаунта не має сенсу
+                    item_key = (item[0], str(item[1]))
+                    if item_key in seen:
+                        deferred.append(item)
+                    else:
+                        seen.add(item_key)
+                        batch.append(item)
+                for item in deferred:
+                    queue.put_nowait(item)
+            
+            try:
+                results = await self._batch_request([(op, variables) for op, variables, _ in batch])
+            except asyncio.CancelledError:
+                # aclose() зупиняє воркерів - не лишаємо викликачів чекати вічно
+                for _, _, future in batch:
+                    future.cancel()
+                raise
             except Exception as e:
-                print(f"❌ Request error: {e}")
-                return None
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (_, _, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
     
     async def like_tweet(self, tweet_id: str) -> bool:
         """Лайкнути твіт"""
         variables = {"tweet_id": tweet_id}
-        result = await self._make_direct_request("FavoriteTweet", variables)
+        result = await self._submit("FavoriteTweet", variables)
         return result is not None
     
     async def unlike_tweet(self, tweet_id: str) -> bool:
         """Прибрати лайк з твіта"""
         variables = {"tweet_id": tweet_id}
-        result = await self._make_direct_request("UnfavoriteTweet", variables)
+        result = await self._submit("UnfavoriteTweet", variables)
         return result is not None
     
     async def retweet(self, tweet_id: str) -> bool:
         """Ретвітнути твіт"""
         variables = {"tweet_id": tweet_id, "dark_request": False}
-        result = await self._make_direct_request("CreateRetweet", variables)
+        result = await self._submit("CreateRetweet", variables)
         return result is not None
     
     async def unretweet(self, tweet_id: str) -> bool:
         """Прибрати ретвіт"""
         variables = {"source_tweet_id": tweet_id, "dark_request": False}
-        result = await self._make_direct_request("DeleteRetweet", variables)
+        result = await self._submit("DeleteRetweet", variables)
         return result is not None
     
     async def view_tweet(self, tweet_id: str) -> bool:
@@ -6,6 +6,7 @@ This script provides a unified interface to manage accounts and run the automati
 """
 
 import asyncio
+import inspect
 import os
 import sys
 from typing import Optional
@@ -14,9 +15,25 @@ from typing import Optional
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from twscrape import API
+from twscrape.account import close_shared_transports
+from runtime import ainput, install_uvloop
 from twitter_automation import TwitterAutomation
 from telegram_bot import TwitterTelegramBot, TwitterBotConfig
 
+# Скільки акаунтів логінимо одночасно (обмежено лімітами IMAP-провайдера)
+LOGIN_CONCURRENCY = 10
+
+# Один API (і пул акаунтів) на всю інтерактивну сесію
+_api: Optional[API] = None
+
+
+def get_api() -> API:
+    """Shared twscrape API for all menu actions."""
+    global _api
+    if _api is None:
+        _api = API()
+    return _api
+
 
 def load_env_file(file_path: str = "config.env"):
     """Load environment variables from a file."""
@@ -25,11 +42,35 @@ def load_env_file(file_path: str = "config.env"):
         return
     
     with open(file_path, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#') and '=' in line:
-                key, value = line.split('=', 1)
-                os.environ[key.strip()] = value.strip()
+        text = f.read()
+    
+    pairs = (line.split('=', 1) for line in map(str.strip, text.splitlines())
+             if line and not line.startswith('#') and '=' in line)
+    os.environ.update({key.strip(): value.strip() for key, value in pairs})
+
+
+async def run_closing(coro):
+    """Await a coroutine, then close the twscrape connections opened in this event loop."""
+    try:
+        return await coro
+    finally:
+        # Кожен asyncio.run() - новий loop, з'єднання попереднього вже не придатні
+        await close_shared_transports()
+
+
+async def login_parallel(pool, max_concurrent: int = LOGIN_CONCURRENCY) -> dict:
+    """Log in inactive accounts concurrently, like pool.login_all() but up to max_concurrent at a time."""
+    sem = asyncio.Semaphore(max_concurrent)
+    # Ті самі акаунти, що й у login_all: неактивні й без помилки
+    accounts = [acc for acc in await pool.get_all() if not acc.active and acc.error_msg is None]
+    
+    async def _login(account):
+        async with sem:
+            return await pool.login(account)
+    
+    results = await asyncio.gather(*[_login(acc) for acc in accounts], return_exceptions=True)
+    success = results.count(True)
+    return {"total": len(accounts), "success": success, "failed": len(accounts) - success}
 
 
 async def setup_accounts():
@@ -45,7 +86,7 @@ async def setup_accounts():
     print("6. Back to main menu")
     print()
     
-    choice = input("Enter your choice (1-6): ").strip()
+    choice = (await ainput("Enter your choice (1-6): ")).strip()
     
     if choice == "1":
         # Import and run bulk account setup
@@ -57,18 +98,18 @@ async def setup_accounts():
         await show_accounts_status()
     
     elif choice == "3":
-        api = API()
-        print("🔄 Logging in all accounts...")
-        result = await api.pool.login_all()
+        api = get_api()
+        print(f"🔄 Logging in all accounts ({LOGIN_CONCURRENCY} at a time)...")
+        result = await login_parallel(api.pool)
         print(f"✅ Success: {result['success']}, ❌ Failed: {result['failed']}")
     
     elif choice == "4":
-        api = API()
+        api = get_api()
         await api.pool.reset_locks()
         print("✅ All account locks have been reset.")
     
     elif choice == "5":
-        api = API()
+        api = get_api()
         await api.pool.delete_inactive()
         print("✅ All inactive accounts have been deleted.")
     
@@ -78,7 +119,7 @@ async def setup_accounts():
     else:
         print("❌ Invalid choice.")
     
-    input("\nPress Enter to continue...")
+    await ainput("\nPress Enter to continue...")
 
 
 async def test_automation():
@@ -87,7 +128,7 @@ async def test_automation():
     print("=" * 50)
     print()
     
-    api = API()
+    api = get_api()
     automation = TwitterAutomation(api)
     
     # Get account status
@@ -96,11 +137,11 @@ async def test_automation():
     
     if not active_accounts:
         print("❌ No active accounts available. Please setup accounts first.")
-        input("Press Enter to continue...")
+        await ainput("Press Enter to continue...")
         return
     
     # Get test URL
-    test_url = input("🔗 Enter a Twitter/X URL to test (or press Enter for demo): ").strip()
+    test_url = (await ainput("🔗 Enter a Twitter/X URL to test (or press Enter for demo): ")).strip()
     
     if not test_url:
         test_url = "https://x.com/elonmusk/status/1234567890"
@@ -128,8 +169,10 @@ async def test_automation():
                 
     except Exception as e:
         print(f"❌ Test failed: {e}")
+    finally:
+        await automation.aclose()
     
-    input("\nPress Enter to continue...")
+    await ainput("\nPress Enter to continue...")
 
 
 def run_telegram_bot():
@@ -166,7 +209,7 @@ async def manual_process():
     print("=" * 50)
     print()
     
-    api = API()
+    api = get_api()
     automation = TwitterAutomation(api)
     
     # Get account status
@@ -175,14 +218,14 @@ async def manual_process():
     
     if not active_accounts:
         print("❌ No active accounts available. Please setup accounts first.")
-        input("Press Enter to continue...")
+        await ainput("Press Enter to continue...")
         return
     
     # Get tweet URL
-    tweet_url = input("🔗 Enter Twitter/X URL: ").strip()
+    tweet_url = (await ainput("🔗 Enter Twitter/X URL: ")).strip()
     if not tweet_url:
         print("❌ No URL provided.")
-        input("Press Enter to continue...")
+        await ainput("Press Enter to continue...")
         return
     
     print()
@@ -192,16 +235,16 @@ async def manual_process():
     print("3. High engagement")
     print("4. Low engagement")
     
-    mode = input("\nChoose mode (1-4): ").strip()
+    mode = (await ainput("\nChoose mode (1-4): ")).strip()
     
     try:
         if mode == "1":
             result = await automation.auto_engage_tweet(tweet_url)
         
         elif mode == "2":
-            likes = int(input("❤️ Number of likes: ") or "0")
-            retweets = int(input("🔄 Number of retweets: ") or "0") 
-            views = int(input("👀 Number of views: ") or "0")
+            likes = int(await ainput("❤️ Number of likes: ") or "0")
+            retweets = int(await ainput("🔄 Number of retweets: ") or "0") 
+            views = int(await ainput("👀 Number of views: ") or "0")
             result = await automation.process_tweet_url(tweet_url, likes, retweets, views)
         
         elif mode == "3":
@@ -222,7 +265,7 @@ async def manual_process():
         
         else:
             print("❌ Invalid mode.")
-            input("Press Enter to continue...")
+            await ainput("Press Enter to continue...")
             return
         
         print("\n📊 Processing Results:")
@@ -240,12 +283,22 @@ async def manual_process():
     
     except Exception as e:
         print(f"❌ Processing failed: {e}")
+    finally:
+        await automation.aclose()
     
-    input("\nPress Enter to continue...")
+    await ainput("\nPress Enter to continue...")
 
 
 def main_menu():
     """Display main menu and handle user choices."""
+    handlers = {
+        "1": setup_accounts,
+        "2": run_telegram_bot,
+        "3": manual_process,
+        "4": test_automation,
+        "5": show_system_status,
+    }
+    
     while True:
         os.system('cls' if os.name == 'nt' else 'clear')  # Clear screen
         
@@ -262,28 +315,18 @@ def main_menu():
         
         choice = input("Enter your choice (1-6): ").strip()
         
-        if choice == "1":
-            asyncio.run(setup_accounts())
-        
-        elif choice == "2":
-            run_telegram_bot()
-        
-        elif choice == "3":
-            asyncio.run(manual_process())
-        
-        elif choice == "4":
-            asyncio.run(test_automation())
-        
-        elif choice == "5":
-            asyncio.run(show_system_status())
-        
-        elif choice == "6":
+        if choice == "6":
             print("👋 Goodbye!")
             break
         
-        else:
+        handler = handlers.get(choice)
+        if handler is None:
             print("❌ Invalid choice. Please try again.")
             input("Press Enter to continue...")
+        elif inspect.iscoroutinefunction(handler):
+            asyncio.run(run_closing(handler()))
+        else:
+            handler()
 
 
 async def show_system_status():
@@ -292,7 +335,7 @@ async def show_system_status():
     print("=" * 50)
     
     try:
-        api = API()
+        api = get_api()
         
         # Account statistics
         stats = await api.pool.stats()
@@ -304,11 +347,9 @@ async def show_system_status():
         # Show locked queues
         locked_queues = [k for k in stats.keys() if k.startswith('locked_')]
         if locked_queues:
-            print(f"\n🔒 Locked Queues:")
-            for queue in locked_queues:
-                count = stats[queue]
-                queue_name = queue.replace('locked_', '')
-                print(f"• {queue_name}: {count} accounts locked")
+            lines = ["\n🔒 Locked Queues:\n"]
+            lines.extend(f"• {queue.replace('locked_', '')}: {stats[queue]} accounts locked\n" for queue in locked_queues)
+            sys.stdout.writelines(lines)
         
         # Configuration status
         print(f"\n⚙️ Configuration:")
@@ -319,7 +360,7 @@ async def show_system_status():
     except Exception as e:
         print(f"❌ Error getting status: {e}")
     
-    input("\nPress Enter to continue...")
+    await ainput("\nPress Enter to continue...")
 
 
 def main():
@@ -327,6 +368,9 @@ def main():
     # Load configuration
     load_env_file()
     
+    # Усі asyncio.run() нижче створюватимуть швидший loop на libuv
+    install_uvloop()
+    
     # Show welcome message
     print("🚀 Welcome to Twitter/X Automation System!")
     print()
@@ -339,15 +383,15 @@ def main():
     
     # Check if we have any accounts
     try:
-        api = API()
-        accounts_info = asyncio.run(api.pool.accounts_info())
+        api = get_api()
+        accounts_info = asyncio.run(run_closing(api.pool.accounts_info()))
         
         if not accounts_info:
             print("ℹ️ No accounts found. Let's set them up first!")
             input("Press Enter to continue to account setup...")
-            asyncio.run(setup_accounts())
+            asyncio.run(run_closing(setup_accounts()))
         else:
-            active_count = sum(1 for acc in accounts_info if acc["active"])
+            active_count = len([acc for acc in accounts_info if acc["active"]])
             print(f"✅ Found {len(accounts_info)} accounts ({active_count} active)")
     
     except Exception as e:
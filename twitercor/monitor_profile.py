@@ -6,71 +6,228 @@ This script continuously monitors a specific Twitter/X profile for new posts
 and automatically extracts data from them.
 
 Usage:
-    python monitor_profile.py @username
+    python monitor_profile.py @username [@username ...]
     python monitor_profile.py elonmusk
     
 Example:
     python monitor_profile.py @elonmusk
+    python monitor_profile.py @elonmusk @nasa
 """
 
 import asyncio
+import dataclasses
+import hashlib
 import json
+import math
+import mmap
+import struct
 import sys
 import os
+from array import array
 from datetime import datetime, timezone
-from typing import Set, Optional
+from typing import Iterator, List, Optional
 import time
 
+try:
+    import orjson
+except ImportError:  # orjson - необов'язкове прискорення, є запасний варіант на json
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # без ijson старий JSON зі списком id читається повністю
+    ijson = None
+
 from twscrape import API
+from twscrape.account import close_shared_transports
 from twscrape.models import Tweet, User
+from runtime import install_uvloop
+
+# Bloom-фільтр переглянутих твітів: на скільки id розрахований і яка частка хибних збігів
+BLOOM_CAPACITY = 1_000_000
+BLOOM_ERROR_RATE = 1e-7
+# Заголовок файлу фільтра: magic, кількість біт, кількість хешів, кількість доданих id
+_BLOOM_HEADER = struct.Struct("<4sQIQ")
+_BLOOM_MAGIC = b"BLM1"
+# Усі збережені твіти - по рядку JSON у tweets.ndjson в теці профілю
+TWEETS_LOG_NAME = "tweets.ndjson"
+# У скільки разів максимум розтягуємо інтервал опитування, поки профіль мовчить
+IDLE_BACKOFF_MAX = 10
+# Як часто (секунди) скидаємо фільтр на диск і очищаємо журнал нових id
+SEEN_COMPACT_INTERVAL = 3600
+
+
+def _json_default(obj):
+    """Serialize twscrape models field by field without copying them first."""
+    if dataclasses.is_dataclass(obj) and hasattr(obj, "__dict__"):
+        # Поля моделі як є (разом з _type); вкладені моделі пройдуть сюди ж
+        return vars(obj)
+    return str(obj)
+
+
+def _json_line(data: dict) -> bytes:
+    """One NDJSON line for the data."""
+    if orjson is not None:
+        # PASSTHROUGH: власна серіалізація orjson пропускає поля з "_" (_type карток)
+        return orjson.dumps(data, default=_json_default, option=orjson.OPT_NON_STR_KEYS
+                            | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(data, ensure_ascii=False, default=_json_default) + "\n").encode()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter of tweet ids, memory-mapped to a file."""
+    
+    def __init__(self, path: str, capacity: int = BLOOM_CAPACITY, error_rate: float = BLOOM_ERROR_RATE):
+        if not os.path.exists(path) or os.path.getsize(path) < _BLOOM_HEADER.size:
+            num_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+            num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+            with open(path, 'wb') as f:
+                f.write(_BLOOM_HEADER.pack(_BLOOM_MAGIC, num_bits, num_hashes, 0))
+                # Решта файлу - нульові біти (на більшості ФС файл лишається розрідженим)
+                f.truncate(_BLOOM_HEADER.size + (num_bits + 7) // 8)
+        
+        self._file = open(path, 'r+b')
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+        magic, self.num_bits, self.num_hashes, self.count = _BLOOM_HEADER.unpack_from(self._mm, 0)
+        if magic != _BLOOM_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a seen-tweets Bloom filter")
+    
+    def _positions(self, tweet_id: int) -> Iterator[int]:
+        # Подвійне хешування: дві 64-бітні половини одного blake2b дають усі k позицій
+        h1, h2 = struct.unpack('<QQ', hashlib.blake2b(tweet_id.to_bytes(8, 'little'), digest_size=16).digest())
+        h2 |= 1
+        num_bits = self.num_bits
+        return ((h1 + i * h2) % num_bits for i in range(self.num_hashes))
+    
+    def __contains__(self, tweet_id: int) -> bool:
+        mm, offset = self._mm, _BLOOM_HEADER.size
+        return all(mm[offset + (pos >> 3)] & (1 << (pos & 7)) for pos in self._positions(tweet_id))
+    
+    def add(self, tweet_id: int) -> bool:
+        """Add an id; False if it was (probably) already there."""
+        mm, offset = self._mm, _BLOOM_HEADER.size
+        added = False
+        for pos in self._positions(tweet_id):
+            index, bit = offset + (pos >> 3), 1 << (pos & 7)
+            byte = mm[index]
+            if not byte & bit:
+                mm[index] = byte | bit
+                added = True
+        if added:
+            self.count += 1
+        return added
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def flush(self):
+        """Write the header and the changed pages to disk."""
+        _BLOOM_HEADER.pack_into(self._mm, 0, _BLOOM_MAGIC, self.num_bits, self.num_hashes, self.count)
+        self._mm.flush()
+    
+    def close(self):
+        """Flush and release the mapping."""
+        if not self._mm.closed:
+            if self._mm[:4] == _BLOOM_MAGIC:
+                self.flush()
+            self._mm.close()
+        self._file.close()
 
 
 class ProfileMonitor:
-    def __init__(self, username: str, check_interval: int = 60):
+    def __init__(self, username: str, check_interval: int = 60, api: Optional[API] = None):
         """
         Initialize profile monitor.
         
         Args:
             username: Twitter username to monitor (with or without @)
             check_interval: How often to check for new posts (seconds)
+            api: Shared API instance (one account pool for several monitors)
         """
         self.username = username.lstrip('@')
         self.check_interval = check_interval
-        self.api = API()
-        self.seen_tweet_ids: Set[int] = set()
+        self.api = api or API()
         self.user_info: Optional[User] = None
         self.monitoring = False
+        # Скільки опитувань поспіль не принесли нових твітів
+        self._empty_streak = 0
         
         # Create output directory
         self.output_dir = f"monitor_{self.username}"
         os.makedirs(self.output_dir, exist_ok=True)
+        # Шляхи файлів монітора будуємо від готового префікса
+        self._outdir_prefix = self.output_dir + os.sep
+        
+        # Переглянуті твіти: фіксований розмір незалежно від тривалості моніторингу
+        self.bloom = BloomFilter(f"{self._outdir_prefix}seen_tweets.bf")
+        
+        # Журнал id, доданих після останнього скидання фільтра: 8 байт на твіт
+        self._seen_log_path = f"{self._outdir_prefix}seen.bin"
+        self._last_compact = time.monotonic()
+        # Найбільший переглянутий id: стрічка йде від нових до старих, тож далі нього нічого нового
+        self.max_seen_id = 0
         
         # Load previously seen tweets
         self.load_seen_tweets()
+        self._seen_fp = open(self._seen_log_path, 'ab', buffering=0)
+        # Одразу скидаємо імпортоване у фільтр, у журналі лишається тільки max_seen_id
+        self.save_seen_tweets()
+        # Один файл на всі твіти замість окремого файлу на кожен
+        self._tweet_log = open(self._outdir_prefix + TWEETS_LOG_NAME, 'ab')
+        # Черга записів твітів і фонова задача, що пише їх на диск поза event loop
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
     
     def load_seen_tweets(self):
-        """Load previously seen tweet IDs from file."""
-        seen_file = os.path.join(self.output_dir, "seen_tweets.json")
-        if os.path.exists(seen_file):
+        """Load previously seen tweet IDs, importing the old JSON list into a fresh filter."""
+        seen_file = f"{self._outdir_prefix}seen_tweets.json"
+        if not len(self.bloom) and os.path.exists(seen_file):
             try:
-                with open(seen_file, 'r') as f:
-                    data = json.load(f)
-                    self.seen_tweet_ids = set(data.get('seen_ids', []))
-                print(f"📚 Loaded {len(self.seen_tweet_ids)} previously seen tweets")
+                with open(seen_file, 'rb') as f:
+                    # ijson (якщо встановлено) віддає id по одному, не будуючи весь список у пам'яті
+                    seen_ids = ijson.items(f, 'seen_ids.item') if ijson is not None else json.load(f).get('seen_ids', [])
+                    for tweet_id in seen_ids:
+                        tweet_id = int(tweet_id)
+                        self.bloom.add(tweet_id)
+                        self.max_seen_id = max(self.max_seen_id, tweet_id)
             except Exception as e:
                 print(f"⚠️  Could not load seen tweets: {e}")
+        
+        # Id з журналу могли не потрапити у файл фільтра, якщо процес не завершився штатно
+        if os.path.exists(self._seen_log_path):
+            try:
+                logged = array('Q')
+                with open(self._seen_log_path, 'rb') as f:
+                    raw = f.read()
+                logged.frombytes(raw[:len(raw) - len(raw) % logged.itemsize])
+                if sys.byteorder != 'little':
+                    logged.byteswap()
+                for tweet_id in logged:
+                    self.bloom.add(tweet_id)
+                self.max_seen_id = max(self.max_seen_id, max(logged, default=0))
+            except Exception as e:
+                print(f"⚠️  Could not replay seen tweets log: {e}")
+        
+        if len(self.bloom):
+            print(f"📚 Loaded {len(self.bloom)} previously seen tweets")
+    
+    def mark_seen(self, tweet_id: int):
+        """Remember a tweet ID, appending it to the on-disk log."""
+        if self.bloom.add(tweet_id):
+            self._seen_fp.write(struct.pack('<Q', tweet_id))
+        if tweet_id > self.max_seen_id:
+            self.max_seen_id = tweet_id
     
     def save_seen_tweets(self):
-        """Save seen tweet IDs to file."""
-        seen_file = os.path.join(self.output_dir, "seen_tweets.json")
+        """Flush the filter to disk and empty the seen-IDs log (keeping max_seen_id)."""
         try:
-            data = {
-                'seen_ids': list(self.seen_tweet_ids),
-                'last_update': datetime.now().isoformat(),
-                'username': self.username
-            }
-            with open(seen_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            # Записуються лише змінені сторінки фільтра, а не весь список id
+            self.bloom.flush()
+            self._seen_fp.truncate(0)
+            if self.max_seen_id:
+                self._seen_fp.write(struct.pack('<Q', self.max_seen_id))
+            self._last_compact = time.monotonic()
         except Exception as e:
             print(f"⚠️  Could not save seen tweets: {e}")
     
@@ -90,21 +247,17 @@ class ProfileMonitor:
             print(f"❌ Error fetching user info: {e}")
             return False
     
-    async def save_tweet_data(self, tweet: Tweet):
-        """Save comprehensive tweet data to file."""
+    async def save_tweet_data(self, tweet: Tweet, date_iso: Optional[str] = None,
+                              extracted_at: Optional[str] = None, echo: bool = True):
+        """Append comprehensive tweet data to the profile's NDJSON log."""
         try:
-            # Create filename with timestamp and tweet ID
-            timestamp = tweet.date.strftime("%Y%m%d_%H%M%S")
-            filename = f"tweet_{timestamp}_{tweet.id}.json"
-            filepath = os.path.join(self.output_dir, filename)
-            
-            # Prepare comprehensive data
+            # Prepare comprehensive data; models go in as-is and are encoded without .dict() copies
             data = {
                 "tweet": {
                     "id": tweet.id,
                     "id_str": tweet.id_str,
                     "url": tweet.url,
-                    "date": tweet.date.isoformat(),
+                    "date": date_iso or tweet.date.isoformat(),
                     "content": tweet.rawContent,
                     "language": tweet.lang,
                     "engagement": {
@@ -117,74 +270,100 @@ class ProfileMonitor:
                     },
                     "hashtags": tweet.hashtags,
                     "cashtags": tweet.cashtags,
-                    "mentioned_users": [user.dict() for user in tweet.mentionedUsers],
-                    "links": [link.dict() for link in tweet.links],
+                    "mentioned_users": tweet.mentionedUsers,
+                    "links": tweet.links,
                     "source": tweet.source,
                     "source_label": tweet.sourceLabel
                 },
-                "user": tweet.user.dict(),
+                "user": tweet.user,
                 "media": None,
                 "location": None,
                 "reply_info": None,
                 "retweet_info": None,
                 "quote_info": None,
                 "card": None,
-                "extracted_at": datetime.now().isoformat()
+                "extracted_at": extracted_at or datetime.now().isoformat()
             }
             
             # Add media if present
             if tweet.media:
                 data["media"] = {
-                    "photos": [photo.dict() for photo in tweet.media.photos],
-                    "videos": [video.dict() for video in tweet.media.videos],
-                    "animated": [anim.dict() for anim in tweet.media.animated]
+                    "photos": tweet.media.photos,
+                    "videos": tweet.media.videos,
+                    "animated": tweet.media.animated
                 }
             
             # Add location if present
             if tweet.place:
                 data["location"] = {
-                    "place": tweet.place.dict(),
-                    "coordinates": tweet.coordinates.dict() if tweet.coordinates else None
+                    "place": tweet.place,
+                    "coordinates": tweet.coordinates
                 }
             
             # Add reply info
             if tweet.inReplyToTweetId:
                 data["reply_info"] = {
                     "in_reply_to_tweet_id": tweet.inReplyToTweetId,
-                    "in_reply_to_user": tweet.inReplyToUser.dict() if tweet.inReplyToUser else None
+                    "in_reply_to_user": tweet.inReplyToUser
                 }
             
             # Add retweet info
             if tweet.retweetedTweet:
                 data["retweet_info"] = {
-                    "original_tweet": tweet.retweetedTweet.dict(),
-                    "original_user": tweet.retweetedTweet.user.dict()
+                    "original_tweet": tweet.retweetedTweet,
+                    "original_user": tweet.retweetedTweet.user
                 }
             
             # Add quote info
             if tweet.quotedTweet:
                 data["quote_info"] = {
-                    "quoted_tweet": tweet.quotedTweet.dict(),
-                    "quoted_user": tweet.quotedTweet.user.dict()
+                    "quoted_tweet": tweet.quotedTweet,
+                    "quoted_user": tweet.quotedTweet.user
                 }
             
             # Add card info
             if tweet.card:
-                data["card"] = tweet.card.dict()
+                data["card"] = tweet.card
             
-            # Save to file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+            # Append to the log (in the background writer while monitoring)
+            if self._write_queue is not None:
+                self._write_queue.put_nowait(data)
+            else:
+                self._append_tweets([data])
             
-            print(f"💾 Saved: {filename}")
-            return filepath
+            if echo:
+                print(f"💾 Saved: {tweet.id} -> {TWEETS_LOG_NAME}")
+            return self._tweet_log.name
             
         except Exception as e:
             print(f"❌ Error saving tweet data: {e}")
             return None
     
-    def format_tweet_notification(self, tweet: Tweet) -> str:
+    def _append_tweets(self, records: List[dict]):
+        """Encode records and append them to the NDJSON log."""
+        self._tweet_log.write(b"".join(map(_json_line, records)))
+        self._tweet_log.flush()
+    
+    async def _tweet_writer(self):
+        """Write queued tweet records to disk in a worker thread."""
+        queue = self._write_queue
+        while True:
+            records = [await queue.get()]
+            # Усе, що накопичилось за час попереднього запису, - одним викликом
+            while not queue.empty():
+                records.append(queue.get_nowait())
+            try:
+                await asyncio.to_thread(self._append_tweets, records)
+            except Exception as e:
+                print(f"❌ Error saving tweet data: {e}")
+            finally:
+                for _ in records:
+                    queue.task_done()
+    
+    def format_tweet_notification(self, tweet: Tweet, date_iso: Optional[str] = None) -> str:
         """Format tweet for console notification."""
+        # "YYYY-MM-DDTHH:MM:SS..." -> "YYYY-MM-DD HH:MM:SS" без окремого strftime
+        date_str = (date_iso or tweet.date.isoformat())[:19].replace('T', ' ')
         content = tweet.rawContent
         if len(content) > 100:
             content = content[:97] + "..."
@@ -206,7 +385,7 @@ class ProfileMonitor:
         
         return f"""
 🆕 NEW TWEET from @{tweet.user.username}
-📅 {tweet.date.strftime('%Y-%m-%d %H:%M:%S')}
+📅 {date_str}
 📝 {content}
 📊 {engagement}{media_info}
 🔗 {tweet.url}
@@ -217,28 +396,45 @@ class ProfileMonitor:
         try:
             new_tweets = 0
             tweets_checked = 0
+            # Один час "extracted_at" на весь цикл опитування
+            extracted_at = datetime.now().isoformat()
+            # Вивід усіх нових твітів циклу - одним записом у stdout
+            buf = []
+            # Межа з попереднього опитування: mark_seen() піднімає max_seen_id вже під час
+            # читання стрічки, і без копії старіші нові твіти цього циклу вважались би переглянутими
+            cutoff = self.max_seen_id
             
-            # Get recent tweets (limit to 20 to avoid rate limits)
-            async for tweet in self.api.user_tweets(self.user_info.id, limit=20):
-                tweets_checked += 1
-                
-                # Skip if we've already seen this tweet
-                if tweet.id in self.seen_tweet_ids:
-                    continue
-                
-                # New tweet found!
-                print(self.format_tweet_notification(tweet))
-                
-                # Save tweet data
-                await self.save_tweet_data(tweet)
-                
-                # Add to seen tweets
-                self.seen_tweet_ids.add(tweet.id)
-                new_tweets += 1
-            
-            # Save updated seen tweets
-            if new_tweets > 0:
-                self.save_seen_tweets()
+            try:
+                # Get recent tweets (limit to 20 to avoid rate limits)
+                async for tweet in self.api.user_tweets(self.user_info.id, limit=20):
+                    tweets_checked += 1
+                    
+                    # Older than everything seen - the rest of the timeline is old too.
+                    # The first tweet may be an old pinned one, so it only gets skipped
+                    if tweet.id <= cutoff:
+                        if tweets_checked > 1:
+                            break
+                        continue
+                    
+                    # Skip if we've already seen this tweet
+                    if tweet.id in self.bloom:
+                        continue
+                    
+                    # New tweet found!
+                    # Дату твіта форматуємо один раз для сповіщення і запису
+                    date_iso = tweet.date.isoformat()
+                    buf.append(self.format_tweet_notification(tweet, date_iso) + "\n")
+                    
+                    # Save tweet data
+                    if await self.save_tweet_data(tweet, date_iso, extracted_at, echo=False):
+                        buf.append(f"💾 Saved: {tweet.id} -> {TWEETS_LOG_NAME}\n")
+                    
+                    # Add to seen tweets
+                    self.mark_seen(tweet.id)
+                    new_tweets += 1
+            finally:
+                if buf:
+                    sys.stdout.write("".join(buf))
             
             return new_tweets
             
@@ -261,9 +457,8 @@ class ProfileMonitor:
         print("🔄 Loading recent tweets to establish baseline...")
         try:
             async for tweet in self.api.user_tweets(self.user_info.id, limit=10):
-                self.seen_tweet_ids.add(tweet.id)
-            self.save_seen_tweets()
-            print(f"✅ Baseline established with {len(self.seen_tweet_ids)} tweets")
+                self.mark_seen(tweet.id)
+            print(f"✅ Baseline established with {len(self.bloom)} tweets")
         except Exception as e:
             print(f"⚠️  Could not establish baseline: {e}")
         
@@ -271,6 +466,9 @@ class ProfileMonitor:
         print(f"\n👀 Now monitoring @{self.username} for new tweets...")
         print("Press Ctrl+C to stop monitoring\n")
         
+        self._write_queue = asyncio.Queue()
+        self._writer = asyncio.create_task(self._tweet_writer())
+        
         try:
             while self.monitoring:
                 start_time = time.time()
@@ -278,13 +476,21 @@ class ProfileMonitor:
                 # Check for new tweets
                 new_count = await self.check_for_new_tweets()
                 
+                # Профіль мовчить - опитуємо вдвічі рідше (до IDLE_BACKOFF_MAX разів), новий твіт скидає інтервал
+                self._empty_streak = 0 if new_count else self._empty_streak + 1
+                interval = min(self.check_interval * 2 ** self._empty_streak,
+                               self.check_interval * IDLE_BACKOFF_MAX)
+                
                 if new_count == 0:
                     current_time = datetime.now().strftime('%H:%M:%S')
-                    print(f"⏰ {current_time} - No new tweets from @{self.username}")
+                    print(f"⏰ {current_time} - No new tweets from @{self.username} (next check in {interval}s)")
+                
+                if time.monotonic() - self._last_compact > SEEN_COMPACT_INTERVAL:
+                    self.save_seen_tweets()
                 
                 # Wait for next check
                 elapsed = time.time() - start_time
-                sleep_time = max(0, self.check_interval - elapsed)
+                sleep_time = max(0, interval - elapsed)
                 
                 if sleep_time > 0:
                     await asyncio.sleep(sleep_time)
@@ -295,23 +501,51 @@ class ProfileMonitor:
             print(f"\n❌ Monitoring error: {e}")
         finally:
             self.monitoring = False
-            print(f"📊 Final stats: {len(self.seen_tweet_ids)} total tweets tracked")
+            # Дописуємо твіти, що ще чекають у черзі
+            await self._write_queue.join()
+            self._writer.cancel()
+            self._write_queue = self._writer = None
+            print(f"📊 Final stats: {len(self.bloom)} total tweets tracked")
+            self.save_seen_tweets()
+            self._seen_fp.close()
+            self._tweet_log.close()
+            self.bloom.close()
+
+
+async def monitor_profiles(usernames: List[str], check_interval: int = 60, api: Optional[API] = None):
+    """Monitor several profiles concurrently in one event loop with a shared API."""
+    api = api or API()
+    # Один профіль двічі моніторити немає сенсу - у них спільна тека з результатами
+    unique = dict.fromkeys(username.lstrip('@') for username in usernames)
+    monitors = [ProfileMonitor(username, check_interval, api=api) for username in unique]
+    
+    try:
+        if hasattr(asyncio, "TaskGroup"):
+            async with asyncio.TaskGroup() as tg:
+                for monitor in monitors:
+                    tg.create_task(monitor.start_monitoring())
+        else:
+            # Python 3.10 - TaskGroup ще немає
+            await asyncio.gather(*(monitor.start_monitoring() for monitor in monitors))
+    finally:
+        # З'єднання twscrape живуть між опитуваннями - закриваємо їх разом з моніторами
+        await close_shared_transports()
 
 
 async def main():
     """Main function."""
-    if len(sys.argv) != 2:
-        print("Usage: python monitor_profile.py <username>")
+    if len(sys.argv) < 2:
+        print("Usage: python monitor_profile.py <username> [<username> ...]")
         print("\nExamples:")
         print("python monitor_profile.py @elonmusk")
-        print("python monitor_profile.py elonmusk")
+        print("python monitor_profile.py elonmusk nasa")
         sys.exit(1)
     
-    username = sys.argv[1]
+    usernames = sys.argv[1:]
     
     print("🔧 Twitter/X Profile Monitor")
     print("=" * 40)
-    print(f"Target: {username}")
+    print(f"Target: {', '.join(usernames)}")
     print()
     
     # Ask for check interval
@@ -327,12 +561,13 @@ async def main():
         interval = 60
         print("Using default interval: 60 seconds")
     
-    # Create and start monitor
-    monitor = ProfileMonitor(username, interval)
-    await monitor.start_monitoring()
+    # Create and start monitors
+    await monitor_profiles(usernames, interval)
 
 
 if __name__ == "__main__":
+    install_uvloop()
+    
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -11,6 +11,7 @@ Usage:
 import asyncio
 import sys
 from twscrape import API
+from runtime import install_uvloop
 
 
 async def quick_test():
@@ -85,6 +86,8 @@ async def main():
 
 
 if __name__ == "__main__":
+    install_uvloop()
+    
     try:
         result = asyncio.run(main())
         sys.exit(0 if result else 1)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Runtime helpers for Twitter/X Automation System
+
+Console input, event loop setup and config.env numbers shared by the menus and launchers.
+"""
+
+import asyncio
+import os
+import threading
+
+
+async def ainput(prompt: str = "") -> str:
+    """input() that keeps the event loop running while waiting for the user."""
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def deliver(value, error):
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(value)
+    
+    def read():
+        try:
+            value = input(prompt)
+        except BaseException as e:  # EOFError / KeyboardInterrupt
+            value, error = None, e
+        else:
+            error = None
+        try:
+            loop.call_soon_threadsafe(deliver, value, error)
+        except RuntimeError:  # цикл уже закрито - відповідь нікому не потрібна
+            pass
+    
+    # Daemon-потік, а не пул виконавців: після Ctrl+C програма не чекатиме на Enter
+    threading.Thread(target=read, daemon=True).start()
+    return await future
+
+
+def install_uvloop() -> bool:
+    """Make asyncio.run() use uvloop when it is installed."""
+    try:
+        import uvloop
+    except ImportError:  # uvloop немає під Windows - працюємо на стандартному event loop
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
+def env_number(name: str, default, cast=int):
+    """Numeric setting from the environment, `default` (with a warning) if it is not a number."""
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return cast(raw)
+    except ValueError:
+        # Помилка в config.env не повинна валити запуск - працюємо зі значенням за замовчуванням
+        print(f"⚠️ {name}={raw!r} is not a valid number, using {default}")
+        return default
@@ -7,22 +7,19 @@ Usage:
 """
 
 import asyncio
-import subprocess
-import sys
+import importlib.util
 import os
 
 
 def check_dependencies():
     """Check if required dependencies are installed."""
-    try:
-        import httpx
-        import fake_useragent
-        import aiosqlite
-        return True
-    except ImportError as e:
-        print(f"❌ Missing dependency: {e}")
+    # find_spec лише шукає пакет, не виконуючи його імпорт (fake_useragent при імпорті читає свій датасет)
+    missing = [name for name in ("httpx", "fake_useragent", "aiosqlite") if importlib.util.find_spec(name) is None]
+    if missing:
+        print(f"❌ Missing dependency: {', '.join(missing)}")
         print("💡 Install dependencies: pip install -r requirements.txt")
         return False
+    return True
 
 
 def check_accounts():
@@ -58,9 +55,9 @@ def main():
         else:
             return
     
-    # Get username to monitor
-    username = input("\n👤 Enter username to monitor (without @): ").strip()
-    if not username:
+    # Get usernames to monitor
+    usernames = input("\n👤 Enter username(s) to monitor (without @, separated by spaces): ").replace(',', ' ').split()
+    if not usernames:
         print("❌ Username is required")
         return
     
@@ -75,20 +72,17 @@ def main():
     except ValueError:
         interval = 60
     
-    print(f"\n🎯 Starting monitor for @{username} with {interval}s interval")
+    print(f"\n🎯 Starting monitor for {', '.join('@' + u for u in usernames)} with {interval}s interval")
     print("Press Ctrl+C to stop\n")
     
     # Start monitoring
     try:
-        # Create a simple monitor script call
-        cmd = [sys.executable, "monitor_profile.py", username]
-        
-        # Set environment variable for interval
-        env = os.environ.copy()
-        env["MONITOR_INTERVAL"] = str(interval)
+        # У тому ж процесі: без нового інтерпретатора, один пул акаунтів на всі профілі
+        from monitor_profile import monitor_profiles
+        from runtime import install_uvloop
         
-        # Run the monitor
-        subprocess.run(cmd, env=env)
+        install_uvloop()
+        asyncio.run(monitor_profiles(usernames, interval))
         
     except KeyboardInterrupt:
         print("\n👋 Monitor stopped")
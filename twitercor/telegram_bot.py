@@ -10,13 +10,20 @@ import asyncio
 import json
 import logging
 import os
+import random
 import re
+import time
+from collections import OrderedDict, defaultdict, deque
+from itertools import islice
 from typing import Dict, List, Optional
 
 from telegram import Update, Bot
+from telegram.error import RetryAfter
 from telegram.ext import Application, MessageHandler, CommandHandler, filters, ContextTypes
 
 from twscrape import API
+from twscrape.account import close_shared_transports
+from runtime import install_uvloop
 from twitter_automation import TwitterAutomation
 
 
@@ -27,6 +34,112 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Прив'язаний метод: без пошуку атрибута на кожному виклику
+_randint = random.randint
+
+# Скільки оброблених id твітів пам'ятаємо (найстаріші витісняються)
+MAX_PROCESSED_TWEETS = 100_000
+# Посилання на твіт: twitter.com / x.com, /<user>/status/<id> і /i/status/<id> (\w+ покриває і "i").
+# Майже всі посилання в нижньому регістрі, тож IGNORECASE-варіант - лише запасний
+_TWITTER_URL_RE = re.compile(r'https?://(?:www\.)?(?:twitter\.com|x\.com)/\w+/status/\d+')
+_TWITTER_URL_ANYCASE_RE = re.compile(_TWITTER_URL_RE.pattern, re.IGNORECASE)
+# Ліміти Telegram на вихідні повідомлення: на один чат за хвилину і всього за секунду
+CHAT_MESSAGES_PER_MINUTE = 20
+GLOBAL_MESSAGES_PER_SECOND = 30
+# Скільки разів повторюємо відправку після RetryAfter від Telegram
+SEND_RETRIES = 3
+# Через скільки секунд обробки твіта показуємо повідомлення "Processing"
+PROCESSING_NOTICE_DELAY = 3.0
+
+
+# Незмінні частини відповідей на /start, /status і /stats
+WELCOME_TEXT = """
+🤖 **Twitter/X Automation Bot**
+
+I automatically process Twitter/X links posted in this group!
+
+**Commands:**
+• `/start` - Show this message
+• `/status` - Show bot and accounts status
+• `/stats` - Show processing statistics
+• `/process <url>` - Manually process a tweet
+• `/auto on/off` - Toggle auto-processing mode
+
+**Auto Mode:** {auto_mode}
+
+When auto mode is ON, I'll automatically process any Twitter/X links posted in the group with realistic engagement numbers.
+
+Drop a Twitter/X link and watch the magic happen! ✨
+"""
+
+STATUS_TEXT = """
+📊 **Bot Status**
+
+**Accounts:**
+• Total: {total}
+• 🟢 Active: {active}
+• 🔴 Inactive: {inactive}
+
+**Settings:**
+• Auto Mode: {auto_mode}
+• Processed Tweets: {processed}
+
+**Active Accounts:**
+"""
+
+STATS_TEXT = """
+📈 **Processing Statistics**
+
+• Processed Tweets: {processed}
+• Auto Mode: {auto_mode}
+
+**Recent Tweets:**
+"""
+
+
+def _on_off(flag: bool) -> str:
+    """ON/OFF label used in the bot's replies."""
+    return "🟢 ON" if flag else "🔴 OFF"
+
+
+class ChatRateLimiter:
+    """Sliding-window limits on outgoing messages per chat and in total."""
+    
+    def __init__(self, per_chat: int = CHAT_MESSAGES_PER_MINUTE, chat_window: float = 60.0,
+                 total: int = GLOBAL_MESSAGES_PER_SECOND, total_window: float = 1.0):
+        self.per_chat = per_chat
+        self.chat_window = chat_window
+        self.total = total
+        self.total_window = total_window
+        # Час (monotonic) останніх відправок: по чатах і загалом
+        self._chats: Dict[int, deque] = defaultdict(deque)
+        self._all = deque()
+    
+    @staticmethod
+    def _delay(stamps: deque, limit: int, window: float, now: float) -> float:
+        while stamps and now - stamps[0] >= window:
+            stamps.popleft()
+        return stamps[0] + window - now if len(stamps) >= limit else 0.0
+    
+    async def acquire(self, chat_id: int):
+        """Wait until one more message may be sent to the chat."""
+        while True:
+            now = time.monotonic()
+            chat = self._chats[chat_id]
+            delay = max(self._delay(chat, self.per_chat, self.chat_window, now),
+                        self._delay(self._all, self.total, self.total_window, now))
+            # Між перевіркою і записом немає await, тож lock не потрібен
+            if delay <= 0:
+                chat.append(now)
+                self._all.append(now)
+                return
+            await asyncio.sleep(delay)
+
+
+def _parse_ids(value: str) -> frozenset:
+    """Comma-separated Telegram ids (groups are negative) as a frozenset of ints."""
+    return frozenset(int(x) for x in map(str.strip, value.split(",")) if x.lstrip("-").isdigit())
+
 
 class TwitterBotConfig:
     """Configuration for the Twitter automation bot."""
@@ -34,8 +147,10 @@ class TwitterBotConfig:
     def __init__(self):
         # Telegram settings
         self.telegram_bot_token = os.getenv("TELEGRAM_BOT_TOKEN", "")
-        self.allowed_groups = os.getenv("ALLOWED_GROUPS", "").split(",")
-        self.allowed_users = os.getenv("ALLOWED_USERS", "").split(",")
+        self.allowed_groups = _parse_ids(os.getenv("ALLOWED_GROUPS", ""))
+        self.allowed_users = _parse_ids(os.getenv("ALLOWED_USERS", ""))
+        # Без списків доступу бот нікого не обслуговує - відкрити всім можна лише явно через ALLOW_ALL=1
+        self.unrestricted = os.getenv("ALLOW_ALL", "").strip().lower() in ("1", "true", "yes")
         
         # Automation settings
         self.auto_mode = os.getenv("AUTO_MODE", "true").lower() == "true"
@@ -58,8 +173,11 @@ class TwitterTelegramBot:
         self.config = config
         self.api = API()
         self.automation = TwitterAutomation(self.api)
-        self.processed_tweets = set()  # Track processed tweets to avoid duplicates
+        # Track processed tweets to avoid duplicates: id -> None у порядку обробки
+        self.processed_tweets: "OrderedDict[int, None]" = OrderedDict()
         self.last_processing_time = 0
+        # Усі відповіді бота йдуть через лімітер, щоб не впиратися в 429 від Telegram
+        self.limiter = ChatRateLimiter()
         
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start command."""
@@ -67,29 +185,12 @@ class TwitterTelegramBot:
         chat_id = update.effective_chat.id
         
         if not self.is_authorized(user_id, chat_id):
-            await update.message.reply_text("❌ You are not authorized to use this bot.")
+            await self._reply(update, "❌ You are not authorized to use this bot.")
             return
         
-        welcome_text = """
-🤖 **Twitter/X Automation Bot**
-
-I automatically process Twitter/X links posted in this group!
-
-**Commands:**
-• `/start` - Show this message
-• `/status` - Show bot and accounts status
-• `/stats` - Show processing statistics
-• `/process <url>` - Manually process a tweet
-• `/auto on/off` - Toggle auto-processing mode
-
-**Auto Mode:** {}
-
-When auto mode is ON, I'll automatically process any Twitter/X links posted in the group with realistic engagement numbers.
-
-Drop a Twitter/X link and watch the magic happen! ✨
-        """.format("🟢 ON" if self.config.auto_mode else "🔴 OFF")
+        welcome_text = WELCOME_TEXT.format(auto_mode=_on_off(self.config.auto_mode))
         
-        await update.message.reply_text(welcome_text, parse_mode='Markdown')
+        await self._reply(update, welcome_text, parse_mode='Markdown')
 
     async def status_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /status command."""
@@ -97,7 +198,7 @@ Drop a Twitter/X link and watch the magic happen! ✨
         chat_id = update.effective_chat.id
         
         if not self.is_authorized(user_id, chat_id):
-            await update.message.reply_text("❌ You are not authorized to use this bot.")
+            await self._reply(update, "❌ You are not authorized to use this bot.")
             return
         
         # Get account status
@@ -108,30 +209,22 @@ Drop a Twitter/X link and watch the magic happen! ✨
         active_count = len(active_accounts)
         inactive_count = total_accounts - active_count
         
-        status_text = f"""
-📊 **Bot Status**
-
-**Accounts:**
-• Total: {total_accounts}
-• 🟢 Active: {active_count}
-• 🔴 Inactive: {inactive_count}
-
-**Settings:**
-• Auto Mode: {"🟢 ON" if self.config.auto_mode else "🔴 OFF"}
-• Processed Tweets: {len(self.processed_tweets)}
-
-**Active Accounts:**
-        """
-        
         if active_accounts:
-            for account in active_accounts[:10]:  # Show first 10
-                status_text += f"• @{account}\n"
+            lines = [f"• @{account}" for account in active_accounts[:10]]  # Show first 10
             if len(active_accounts) > 10:
-                status_text += f"• ... and {len(active_accounts) - 10} more\n"
+                lines.append(f"• ... and {len(active_accounts) - 10} more")
         else:
-            status_text += "• None\n"
+            lines = ["• None"]
         
-        await update.message.reply_text(status_text, parse_mode='Markdown')
+        status_text = STATUS_TEXT.format(
+            total=total_accounts,
+            active=active_count,
+            inactive=inactive_count,
+            auto_mode=_on_off(self.config.auto_mode),
+            processed=len(self.processed_tweets),
+        ) + "\n".join(lines)
+        
+        await self._reply(update, status_text, parse_mode='Markdown')
 
     async def stats_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /stats command."""
@@ -139,26 +232,18 @@ Drop a Twitter/X link and watch the magic happen! ✨
         chat_id = update.effective_chat.id
         
         if not self.is_authorized(user_id, chat_id):
-            await update.message.reply_text("❌ You are not authorized to use this bot.")
+            await self._reply(update, "❌ You are not authorized to use this bot.")
             return
         
-        stats_text = f"""
-📈 **Processing Statistics**
-
-• Processed Tweets: {len(self.processed_tweets)}
-• Auto Mode: {"🟢 ON" if self.config.auto_mode else "🔴 OFF"}
-
-**Recent Tweets:**
-        """
+        recent_tweets = list(islice(reversed(self.processed_tweets), 5))  # Last 5, newest first
+        lines = [f"• {tweet_id}" for tweet_id in recent_tweets] or ["• None processed yet"]
         
-        recent_tweets = list(self.processed_tweets)[-5:]  # Last 5
-        if recent_tweets:
-            for tweet_id in recent_tweets:
-                stats_text += f"• {tweet_id}\n"
-        else:
-            stats_text += "• None processed yet\n"
+        stats_text = STATS_TEXT.format(
+            processed=len(self.processed_tweets),
+            auto_mode=_on_off(self.config.auto_mode),
+        ) + "\n".join(lines)
         
-        await update.message.reply_text(stats_text, parse_mode='Markdown')
+        await self._reply(update, stats_text, parse_mode='Markdown')
 
     async def process_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /process command."""
@@ -166,11 +251,11 @@ Drop a Twitter/X link and watch the magic happen! ✨
         chat_id = update.effective_chat.id
         
         if not self.is_authorized(user_id, chat_id):
-            await update.message.reply_text("❌ You are not authorized to use this bot.")
+            await self._reply(update, "❌ You are not authorized to use this bot.")
             return
         
         if not context.args:
-            await update.message.reply_text("❌ Please provide a Twitter/X URL. Usage: `/process <url>`", parse_mode='Markdown')
+            await self._reply(update, "❌ Please provide a Twitter/X URL. Usage: `/process <url>`", parse_mode='Markdown')
             return
         
         tweet_url = context.args[0]
@@ -182,48 +267,62 @@ Drop a Twitter/X link and watch the magic happen! ✨
         chat_id = update.effective_chat.id
         
         if not self.is_authorized(user_id, chat_id):
-            await update.message.reply_text("❌ You are not authorized to use this bot.")
+            await self._reply(update, "❌ You are not authorized to use this bot.")
             return
         
         if not context.args or context.args[0].lower() not in ['on', 'off']:
-            await update.message.reply_text("❌ Usage: `/auto on` or `/auto off`", parse_mode='Markdown')
+            await self._reply(update, "❌ Usage: `/auto on` or `/auto off`", parse_mode='Markdown')
             return
         
         new_mode = context.args[0].lower() == 'on'
         self.config.auto_mode = new_mode
         
-        mode_text = "🟢 ON" if new_mode else "🔴 OFF"
-        await update.message.reply_text(f"✅ Auto mode set to: {mode_text}")
+        mode_text = _on_off(new_mode)
+        await self._reply(update, f"✅ Auto mode set to: {mode_text}")
+
+    async def _send(self, chat_id: int, send):
+        """Send a message via the rate limiter, waiting out RetryAfter from Telegram."""
+        for attempt in range(SEND_RETRIES):
+            await self.limiter.acquire(chat_id)
+            try:
+                return await send()
+            except RetryAfter as e:
+                if attempt == SEND_RETRIES - 1:
+                    raise
+                # У нових версіях PTB retry_after - timedelta, у старих - секунди
+                retry_after = e.retry_after
+                delay = retry_after.total_seconds() if hasattr(retry_after, "total_seconds") else float(retry_after)
+                logger.warning(f"Telegram flood control, retrying in {delay:.0f}s")
+                await asyncio.sleep(delay)
+    
+    async def _reply(self, update: Update, text: str, **kwargs):
+        """Rate-limited update.message.reply_text."""
+        return await self._send(update.effective_chat.id, lambda: update.message.reply_text(text, **kwargs))
+    
+    async def _edit(self, update: Update, message, text: str, **kwargs):
+        """Rate-limited message.edit_text."""
+        return await self._send(update.effective_chat.id, lambda: message.edit_text(text, **kwargs))
+
+    async def _respond(self, update: Update, message, text: str, **kwargs):
+        """Edit the "processing" message if one was sent, otherwise reply."""
+        if message is None:
+            return await self._reply(update, text, **kwargs)
+        return await self._edit(update, message, text, **kwargs)
 
     def is_authorized(self, user_id: int, chat_id: int) -> bool:
         """Check if user/group is authorized to use the bot."""
-        # Check if it's an allowed group
-        if str(chat_id) in self.config.allowed_groups:
-            return True
-        
-        # Check if it's an allowed user
-        if str(user_id) in self.config.allowed_users:
-            return True
-        
-        # If no restrictions are set, allow all
-        if not self.config.allowed_groups and not self.config.allowed_users:
-            return True
-        
-        return False
+        # Explicit ALLOW_ALL, an allowed group or an allowed user
+        config = self.config
+        return config.unrestricted or chat_id in config.allowed_groups or user_id in config.allowed_users
 
     def extract_twitter_urls(self, text: str) -> List[str]:
         """Extract Twitter/X URLs from text."""
-        patterns = [
-            r'https?://(?:www\.)?(?:twitter\.com|x\.com)/\w+/status/\d+',
-            r'https?://(?:www\.)?(?:twitter\.com|x\.com)/i/status/\d+',
-        ]
-        
-        urls = []
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            urls.extend(matches)
-        
-        return list(set(urls))  # Remove duplicates
+        urls = _TWITTER_URL_RE.findall(text)
+        # Є "/status/", яке швидкий шаблон не впізнав - можливо, домен у верхньому регістрі
+        if len(urls) < text.lower().count("/status/"):
+            urls = _TWITTER_URL_ANYCASE_RE.findall(text)
+        # dict.fromkeys прибирає дублікати, зберігаючи порядок
+        return list(dict.fromkeys(urls))
 
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle incoming messages and process Twitter links."""
@@ -247,49 +346,60 @@ Drop a Twitter/X link and watch the magic happen! ✨
 
     async def process_tweet_from_message(self, update: Update, tweet_url: str, manual: bool = False):
         """Process a tweet URL from a message."""
+        processing_msg = None
+        work = None
         try:
             # Extract tweet ID
             tweet_id = self.automation.interaction_api.extract_tweet_id(tweet_url)
             if not tweet_id:
                 if manual:
-                    await update.message.reply_text("❌ Invalid Twitter/X URL")
+                    await self._reply(update, "❌ Invalid Twitter/X URL")
                 return
             
             # Check if already processed
+            tweet_id = int(tweet_id)
             if tweet_id in self.processed_tweets:
                 if manual:
-                    await update.message.reply_text("ℹ️ This tweet has already been processed")
+                    await self._reply(update, "ℹ️ This tweet has already been processed")
                 return
             
             # Add random delay for natural behavior (only for auto mode)
             if not manual and len(self.processed_tweets) > 0:
-                import random
-                delay = random.randint(self.config.min_delay, self.config.max_delay)
+                delay = _randint(self.config.min_delay, self.config.max_delay)
                 logger.info(f"Waiting {delay} seconds before processing tweet {tweet_id}")
                 await asyncio.sleep(delay)
             
-            # Send processing message
-            processing_msg = await update.message.reply_text(f"🔄 Processing tweet: {tweet_url}")
-            
             # Process the tweet
             if manual:
                 # For manual processing, use auto-engage (realistic numbers)
-                result = await self.automation.auto_engage_tweet(tweet_url)
+                coro = self.automation.auto_engage_tweet(tweet_url)
             else:
                 # For auto mode, use custom ranges
-                import random
-                likes = random.randint(self.config.default_likes_min, self.config.default_likes_max)
-                retweets = random.randint(self.config.default_retweets_min, self.config.default_retweets_max)
-                views = random.randint(self.config.default_views_min, self.config.default_views_max)
+                likes = _randint(self.config.default_likes_min, self.config.default_likes_max)
+                retweets = _randint(self.config.default_retweets_min, self.config.default_retweets_max)
+                views = _randint(self.config.default_views_min, self.config.default_views_max)
                 
-                result = await self.automation.process_tweet_url(tweet_url, likes, retweets, views)
+                coro = self.automation.process_tweet_url(tweet_url, likes, retweets, views)
+            
+            # "Processing" шлемо лише якщо обробка затягнулась - інакше одразу одне фінальне повідомлення
+            work = asyncio.ensure_future(coro)
+            done, _ = await asyncio.wait({work}, timeout=PROCESSING_NOTICE_DELAY)
+            if not done:
+                try:
+                    processing_msg = await self._reply(update, f"🔄 Processing tweet: {tweet_url}")
+                except Exception as e:
+                    # Обробка вже йде - без повідомлення-індикатора просто відповімо в кінці
+                    logger.warning(f"Could not send processing message: {e}")
+            result = await work
             
             # Add to processed list
-            self.processed_tweets.add(tweet_id)
+            self.processed_tweets[tweet_id] = None
+            if len(self.processed_tweets) > MAX_PROCESSED_TWEETS:
+                self.processed_tweets.popitem(last=False)
             
             # Send result message
             if "error" in result:
-                await processing_msg.edit_text(f"❌ Error: {result['error']}")
+                await self._respond(update, processing_msg, f"❌ Error: {result['error']}")
             else:
                 actions = result.get("actions", {})
                 success_text = f"""
@@ -317,33 +427,41 @@ Drop a Twitter/X link and watch the magic happen! ✨
                 if result.get("errors"):
                     success_text += f"\n⚠️ Some actions failed: {len(result['errors'])} errors"
                 
-                await processing_msg.edit_text(success_text, parse_mode='Markdown')
+                await self._respond(update, processing_msg, success_text, parse_mode='Markdown')
                 
         except Exception as e:
             logger.error(f"Error processing tweet {tweet_url}: {e}")
-            if 'processing_msg' in locals():
-                await processing_msg.edit_text(f"❌ Error processing tweet: {str(e)}")
-            else:
-                await update.message.reply_text(f"❌ Error processing tweet: {str(e)}")
+            await self._respond(update, processing_msg, f"❌ Error processing tweet: {str(e)}")
+        finally:
+            # Якщо хендлер скасували, обробка твіта не лишається висіти у фоні
+            if work is not None and not work.done():
+                work.cancel()
 
     async def error_handler(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle errors."""
         logger.error(f"Update {update} caused error {context.error}")
 
-    def run(self):
-        """Run the Telegram bot."""
+    def _build_application(self) -> Optional[Application]:
+        """Create the bot application with all handlers, None if not configured."""
         if not self.config.telegram_bot_token:
             print("❌ TELEGRAM_BOT_TOKEN environment variable is required!")
             print("Set it with: export TELEGRAM_BOT_TOKEN='your_bot_token_here'")
-            return
+            return None
         
         print("🚀 Starting Twitter/X Automation Telegram Bot...")
         print(f"🤖 Auto mode: {'ON' if self.config.auto_mode else 'OFF'}")
-        print(f"🔧 Allowed groups: {self.config.allowed_groups if self.config.allowed_groups != [''] else 'All'}")
-        print(f"👥 Allowed users: {self.config.allowed_users if self.config.allowed_users != [''] else 'All'}")
+        if self.config.unrestricted:
+            print("⚠️ ALLOW_ALL is set - the bot accepts commands from everyone")
+        else:
+            print(f"🔧 Allowed groups: {sorted(self.config.allowed_groups) if self.config.allowed_groups else 'None'}")
+            print(f"👥 Allowed users: {sorted(self.config.allowed_users) if self.config.allowed_users else 'None'}")
+            if not self.config.allowed_groups and not self.config.allowed_users:
+                print("⚠️ ALLOWED_GROUPS and ALLOWED_USERS are empty - set them (or ALLOW_ALL=1) to use the bot")
         
         # Create application
-        application = Application.builder().token(self.config.telegram_bot_token).build()
+        # post_shutdown спрацьовує після run_polling(); run_async() закриває сам
+        application = (Application.builder().token(self.config.telegram_bot_token)
+                       .post_shutdown(self._post_shutdown).build())
         
         # Add handlers
         application.add_handler(CommandHandler("start", self.start_command))
@@ -358,10 +476,41 @@ Drop a Twitter/X link and watch the magic happen! ✨
         # Error handler
         application.add_error_handler(self.error_handler)
         
+        return application
+
+    async def _post_shutdown(self, application: Application):
+        """Save fast-mode pacing state and close HTTP clients when polling stops."""
+        await self.automation.aclose()
+        # run_polling() закриває свій loop - з'єднання twscrape в ньому більше не знадобляться
+        await close_shared_transports()
+
+    def run(self):
+        """Run the Telegram bot."""
+        application = self._build_application()
+        if application is None:
+            return
+        
         # Run the bot
         print("✅ Bot is running! Send /start to begin.")
         application.run_polling(allowed_updates=Update.ALL_TYPES)
 
+    async def run_async(self):
+        """Run the Telegram bot inside an already running event loop until cancelled."""
+        application = self._build_application()
+        if application is None:
+            return
+        
+        async with application:
+            await application.start()
+            await application.updater.start_polling(allowed_updates=Update.ALL_TYPES)
+            print("✅ Bot is running! Send /start to begin.")
+            try:
+                await asyncio.Event().wait()
+            finally:
+                await application.updater.stop()
+                await application.stop()
+                await self.automation.aclose()
+
 
 async def test_automation():
     """Test function for automation without Telegram."""
@@ -376,6 +525,8 @@ async def test_automation():
     print(f"Testing with URL: {test_url}")
     result = await automation.auto_engage_tweet(test_url)
     
+    await automation.aclose()
+    
     print("Test result:")
     print(json.dumps(result, indent=2, default=str))
 
@@ -385,6 +536,8 @@ def main():
     config = TwitterBotConfig()
     bot = TwitterTelegramBot(config)
     
+    install_uvloop()
+    
     try:
         bot.run()
     except KeyboardInterrupt:
@@ -5,8 +5,25 @@ Quick proxy test script
 import asyncio
 import httpx
 
-async def test_proxy_quick(proxy_string):
-    """Test a single proxy quickly."""
+try:
+    import orjson
+except ImportError:  # orjson - необов'язкове прискорення, є запасний варіант на json
+    orjson = None
+
+# Скільки проксі перевіряємо одночасно в test_proxies
+PROXY_CHECK_CONCURRENCY = 50
+
+
+def make_proxy_client(proxy_string):
+    """HTTP client routed through the proxy, reused for all its test URLs."""
+    return httpx.AsyncClient(
+        mounts={"all://": httpx.AsyncHTTPTransport(proxy=proxy_string, retries=0)},
+        timeout=15.0,
+    )
+
+
+async def test_proxy_quick(proxy_string, client=None):
+    """Test a single proxy quickly (optionally through an already open client)."""
     print(f"🔄 Тестуємо проксі: {proxy_string}")
     
     # Переконуємося що проксі має правильний формат
@@ -21,30 +38,53 @@ async def test_proxy_quick(proxy_string):
         "http://httpbin.org/ip"
     ]
     
+    own_client = client is None
     try:
-        async with httpx.AsyncClient(proxy=proxy_string, timeout=15.0) as client:
+        if own_client:
+            client = make_proxy_client(proxy_string)
+        try:
+            # Усі тести стартують одночасно - чекаємо першої успішної відповіді, а не кожного по черзі
+            tasks = {
+                asyncio.create_task(client.get(url)): url
+                for url in test_urls
+            }
             for i, url in enumerate(test_urls, 1):
-                try:
-                    print(f"📡 Тест {i}: {url}")
-                    response = await client.get(url)
-                    print(f"📊 Статус: {response.status_code}")
-                    
-                    if response.status_code == 200:
+                print(f"📡 Тест {i}: {url}")
+            
+            pending = set(tasks)
+            try:
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        url = tasks[task]
                         try:
-                            data = response.json()
-                            ip = data.get('query') or data.get('ip') or data.get('origin', 'Unknown')
-                            print(f"✅ IP: {ip}")
-                            print(f"✅ Проксі працює через {url}")
-                            return True
-                        except:
-                            print(f"✅ Підключення успішне (не JSON відповідь)")
-                            return True
-                    else:
-                        print(f"❌ HTTP {response.status_code}")
+                            response = task.result()
+                        except Exception as e:
+                            print(f"❌ Помилка з {url}: {str(e)[:100]}")
+                            continue
                         
-                except Exception as e:
-                    print(f"❌ Помилка з {url}: {str(e)[:100]}")
-                    continue
+                        print(f"📊 Статус: {response.status_code} ({url})")
+                        if response.status_code == 200:
+                            try:
+                                # Розбираємо одразу байти, без проміжного декодування в str
+                                data = orjson.loads(response.content) if orjson is not None else response.json()
+                                ip = data.get('query') or data.get('ip') or data.get('origin', 'Unknown')
+                                print(f"✅ IP: {ip}")
+                                print(f"✅ Проксі працює через {url}")
+                                return True
+                            except:
+                                print(f"✅ Підключення успішне (не JSON відповідь)")
+                                return True
+                        else:
+                            print(f"❌ HTTP {response.status_code}")
+            finally:
+                # Решта тестів уже не потрібна
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            if own_client:
+                await client.aclose()
                     
         print("❌ Всі тести не вдалися")
         return False
@@ -53,6 +93,16 @@ async def test_proxy_quick(proxy_string):
         print(f"❌ Загальна помилка: {str(e)}")
         return False
 
+async def test_proxies(proxies):
+    """Test a list of proxies concurrently, returns results in the same order."""
+    semaphore = asyncio.Semaphore(PROXY_CHECK_CONCURRENCY)
+    
+    async def test_one(proxy_string):
+        async with semaphore:
+            return await test_proxy_quick(proxy_string)
+    
+    return await asyncio.gather(*(test_one(p) for p in proxies))
+
 async def main():
     # Ваш проксі
     proxy = "RQQ6C0VF:MZH4VXZU@213.145.79.139:48832"
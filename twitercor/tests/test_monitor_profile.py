@@ -0,0 +1,37 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+from monitor_profile import ProfileMonitor
+
+
+class FakeTimelineAPI:
+    def __init__(self, ids):
+        self.ids = ids
+
+    async def user_tweets(self, user_id, limit=-1):
+        for tweet_id in self.ids:
+            yield SimpleNamespace(id=tweet_id, date=datetime(2024, 1, 1))
+
+
+async def _monitor(tmp_path, monkeypatch, ids):
+    monkeypatch.chdir(tmp_path)
+    monitor = ProfileMonitor("someone", api=FakeTimelineAPI(ids))
+    monitor.user_info = SimpleNamespace(id=1)
+    monkeypatch.setattr(monitor, "format_tweet_notification", lambda tweet, date_iso=None: "")
+
+    async def save_tweet_data(tweet, *args, **kwargs):
+        return None
+
+    monkeypatch.setattr(monitor, "save_tweet_data", save_tweet_data)
+    return monitor
+
+
+async def test_check_for_new_tweets_keeps_all_new_tweets_of_one_poll(tmp_path, monkeypatch):
+    monitor = await _monitor(tmp_path, monkeypatch, [103, 102, 101, 100])
+    monitor.mark_seen(100)
+
+    assert await monitor.check_for_new_tweets() == 3
+    assert all(tweet_id in monitor.bloom for tweet_id in (101, 102, 103))
+    assert monitor.max_seen_id == 103
+
+    assert await monitor.check_for_new_tweets() == 0
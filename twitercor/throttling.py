@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Throttling helpers for Twitter/X Automation System
+
+Rate limiting and retry with exponential backoff shared by the menus and API wrappers.
+"""
+
+import asyncio
+import functools
+import random
+import time
+
+# HTTP статуси, після яких запит варто повторити пізніше
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+class RateLimiter:
+    """Token bucket plus a concurrency cap, used as `async with limiter:`."""
+
+    def __init__(self, rate: float, burst: int = 1, concurrency: int | None = None):
+        # Нульова швидкість означала б ділення на нуль в acquire(), а не "без обмежень"
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        # Семафор прив'язується до event loop, тож лімітер створюємо всередині операції
+        self._sem = asyncio.Semaphore(concurrency) if concurrency else None
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Wait for a free slot and a token."""
+        if self._sem is not None:
+            await self._sem.acquire()
+        try:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+
+                # Між перевіркою і списанням токена немає await, тож lock не потрібен
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+        except BaseException:
+            if self._sem is not None:
+                self._sem.release()
+            raise
+
+    def release(self):
+        """Free the concurrency slot taken by acquire()."""
+        if self._sem is not None:
+            self._sem.release()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+    def state(self) -> tuple[float, float]:
+        """Current tokens and blocked-until (wall-clock, 0 if not blocked) for persisting."""
+        now = time.monotonic()
+        self._refill(now)
+        blocked = self._blocked_until - now
+        return self._tokens, time.time() + blocked if blocked > 0 else 0.0
+
+    def restore(self, tokens: float, blocked_until: float, saved_at: float):
+        """Restore a state() taken at wall-clock time saved_at."""
+        wall, now = time.time(), time.monotonic()
+        # За час простою бакет встиг поповнитись
+        self._tokens = min(self.burst, max(0.0, tokens) + max(0.0, wall - saved_at) * self.rate)
+        self._updated = now
+        self._blocked_until = now + max(0.0, blocked_until - wall)
+
+    def update_from_headers(self, headers):
+        """Tune the rate from x-rate-limit-remaining / x-rate-limit-reset headers."""
+        try:
+            remaining = int(headers["x-rate-limit-remaining"])
+            reset = int(headers["x-rate-limit-reset"])
+        except (KeyError, TypeError, ValueError):
+            return
+
+        window = max(reset - time.time(), 1.0)
+        if remaining <= 0:
+            # Ліміт вичерпано - чекаємо до скидання вікна
+            self._tokens = 0.0
+            self._blocked_until = time.monotonic() + window
+        else:
+            self.rate = remaining / window
+
+
+def backoff_delay(attempt: int, base_delay: float = 1.0, max_delay: float = 30.0) -> float:
+    """Exponential backoff delay with full jitter for the given attempt (0-based)."""
+    return random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+
+def retry_with_backoff(retries: int = 3, base_delay: float = 1.0, max_delay: float = 30.0,
+                       retry_on: tuple = (Exception,)):
+    """Retry an async function on the given exceptions with exponential backoff."""
+    # retries - загальна кількість спроб; з 0 функція не викликалась би зовсім
+    if retries < 1:
+        raise ValueError(f"retries must be at least 1, got {retries}")
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            for attempt in range(retries):
+                try:
+                    return await func(*args, **kwargs)
+                except retry_on:
+                    if attempt == retries - 1:
+                        raise
+                    await asyncio.sleep(backoff_delay(attempt, base_delay, max_delay))
+
+        return wrapper
+
+    return decorator
@@ -6,14 +6,23 @@ This module contains the actual GraphQL operations for likes, retweets, etc.
 """
 
 import asyncio
+import functools
+import importlib.util
 import json
 import random
 import httpx
+from http.cookiejar import CookieJar, DefaultCookiePolicy
 from typing import Dict, Optional
 
+try:
+    import orjson
+except ImportError:  # orjson - необов'язкове прискорення, є запасний варіант на json
+    orjson = None
+
 from twscrape.queue_client import QueueClient
 from twscrape.accounts_pool import AccountsPool
-from twscrape.account import TOKEN  # Імпортуємо стандартний токен
+from twscrape.account import KEEPALIVE_EXPIRY, TOKEN  # Імпортуємо стандартний токен
+from twscrape.logger import logger
 
 
 # Known GraphQL operations for interactions
@@ -34,6 +43,111 @@ GRAPHQL_OPERATIONS = {
 
 GQL_URL = "https://x.com/i/api/graphql"
 
+# HTTP/2 мультиплексує запити в одному з'єднанні, якщо встановлено пакет h2
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+# Ліміт з'єднань одного клієнта; клієнт на проксі ходить лише на x.com, тож це ліміт на хост
+PER_HOST_CONNECTIONS = 128
+# Клієнти з пулом з'єднань, спільні для всіх TwitterActionsAPI: проксі -> клієнт
+_clients: Dict[Optional[str], httpx.AsyncClient] = {}
+_clients_loop = None
+# Готові заголовки на акаунт: username -> (ключ з cookies, headers)
+_account_ctx: Dict[str, tuple] = {}
+
+
+def _get_client(proxy: Optional[str]) -> httpx.AsyncClient:
+    """Keep-alive client for the proxy (None - direct), created in the running loop."""
+    global _clients, _clients_loop
+    loop = asyncio.get_running_loop()
+    if _clients_loop is not loop:
+        # З'єднання прив'язані до event loop, у якому відкриті
+        _clients, _clients_loop = {}, loop
+    
+    client = _clients.get(proxy)
+    if client is None:
+        client = _clients[proxy] = httpx.AsyncClient(
+            proxy=proxy,
+            timeout=30.0,
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_keepalive_connections=max(1, PER_HOST_CONNECTIONS // 2),
+                                max_connections=PER_HOST_CONNECTIONS,
+                                # Довше тримаємо з'єднання: нове - це DNS-запит і TLS-рукостискання
+                                keepalive_expiry=KEEPALIVE_EXPIRY),
+            # Клієнтом користуються різні акаунти - cookies не зберігаємо, їх передає кожен запит
+            cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+        )
+    return client
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_cookie_string(raw: str) -> Dict[str, str]:
+    """Parse a JSON cookie string once; the result is shared, so it must not be mutated."""
+    try:
+        return json.loads(raw) if raw else {}
+    except ValueError:
+        return {}
+
+
+def _parse_cookies(cookies) -> Dict[str, str]:
+    """Account cookies as a dict (the pool may hand them over as a JSON string)."""
+    if isinstance(cookies, str):
+        return _parse_cookie_string(cookies)
+    return cookies or {}
+
+
+def _account_headers(account) -> Dict[str, str]:
+    """Request headers for the account, built once and reused while its cookies stay the same."""
+    cookies_dict = _parse_cookies(account.cookies)
+    # Після релогіну міняються ct0/auth_token - тоді заголовки будуємо заново
+    key = (account.user_agent, cookies_dict.get("ct0"), cookies_dict.get("auth_token"))
+    cached = _account_ctx.get(account.username)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    
+    # Підготовуємо заголовки як в оригінальному twscrape
+    headers = {
+        "authorization": TOKEN,  # Використовуємо стандартний токен
+        "content-type": "application/json",
+        "x-twitter-auth-type": "OAuth2Session",
+        "x-twitter-client-language": "en",
+        "x-twitter-active-user": "yes",
+        "user-agent": account.user_agent,
+    }
+    
+    # Додаємо CSRF токен з cookies якщо є
+    if "ct0" in cookies_dict:
+        headers["x-csrf-token"] = cookies_dict["ct0"]
+    if cookies_dict:
+        headers["cookie"] = "; ".join(f"{k}={v}" for k, v in cookies_dict.items())
+    
+    _account_ctx[account.username] = (key, headers)
+    return headers
+
+
+def _dig(data, *keys):
+    """Nested dict lookup, None as soon as a key is missing or a level is not a dict."""
+    for key in keys:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def set_per_host_limit(limit: int):
+    """Set the connection limit of each proxy's client (applies to clients created afterwards)."""
+    global PER_HOST_CONNECTIONS
+    PER_HOST_CONNECTIONS = max(1, int(limit))
+
+
+async def close_clients():
+    """Close the HTTP clients shared by all TwitterActionsAPI instances."""
+    global _clients
+    clients, _clients = _clients, {}
+    for client in clients.values():
+        try:
+            await client.aclose()
+        except Exception:
+            pass
+
 
 class TwitterActionsAPI:
     """Extended API for Twitter interactions."""
@@ -43,41 +157,26 @@ class TwitterActionsAPI:
         self.debug = debug
         self.proxy = proxy
 
-    async def _make_request(self, operation: str, variables: dict, queue_name: str = None) -> Optional[dict]:
-        """Make a GraphQL request for Twitter actions."""
+    async def aclose(self):
+        """Close the shared HTTP clients (all instances use the same ones)."""
+        await close_clients()
+
+    async def _make_request(self, operation: str, variables: dict, queue_name: str = None,
+                            account=None) -> Optional[dict]:
+        """Make a GraphQL request for Twitter actions (with the given account or one from the pool)."""
         try:
-            # Отримуємо акаунт з пулу з більшою затримкою
-            account = await self.pool.get_for_queue_or_wait(operation)
+            # Отримуємо акаунт з пулу з більшою затримкою, якщо його не передали
+            if account is None:
+                account = await self.pool.get_for_queue_or_wait(operation)
             if not account:
-                print(f"No account available for {operation}")
+                logger.warning(f"No account available for {operation}")
                 return None
             
             operation_id = GRAPHQL_OPERATIONS[operation].split("/")[0]
             operation_name = GRAPHQL_OPERATIONS[operation].split("/")[1] 
             url = f"{GQL_URL}/{operation_id}/{operation_name}"
             
-            # Підготовуємо заголовки як в оригінальному twscrape
-            headers = {
-                "authorization": TOKEN,  # Використовуємо стандартний токен
-                "content-type": "application/json",
-                "x-twitter-auth-type": "OAuth2Session",
-                "x-twitter-client-language": "en",
-                "x-twitter-active-user": "yes",
-                "user-agent": account.user_agent,
-            }
-            
-            # Додаємо CSRF токен з cookies якщо є
-            cookies_dict = account.cookies
-            if isinstance(cookies_dict, str):
-                # Якщо cookies - це рядок, конвертуємо в словник
-                import json
-                try:
-                    cookies_dict = json.loads(cookies_dict) if cookies_dict else {}
-                except:
-                    cookies_dict = {}
-            
-            if "ct0" in cookies_dict:
-                headers["x-csrf-token"] = cookies_dict["ct0"]
+            headers = _account_headers(account)
             
             # Підготовуємо дані для POST запиту
             payload = {
@@ -85,120 +184,120 @@ class TwitterActionsAPI:
                 "queryId": operation_id
             }
             
-            # Використовуємо httpx безпосередньо
-            async with httpx.AsyncClient(
-                cookies=cookies_dict,
-                proxy=self.proxy,
-                timeout=30.0
-            ) as client:
-                response = await client.post(
-                    url, 
-                    json=payload,
-                    headers=headers
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    if self.debug:
-                        print(f"Response for {operation}: {result}")
-                    return result
-                else:
-                    print(f"Request failed with status {response.status_code}: {response.text[:200]}")
-                    return None
+            # Спільний клієнт: TCP/TLS з'єднання з x.com перевикористовуються між діями
+            response = await _get_client(self.proxy).post(
+                url, 
+                json=payload,
+                headers=headers
+            )
+            
+            if response.status_code == 200:
+                # Відповіді GraphQL великі - orjson розбирає їх у рази швидше
+                result = orjson.loads(response.content) if orjson is not None else response.json()
+                if self.debug:
+                    logger.info(f"Response for {operation}: {result}")
+                return result
+            else:
+                logger.warning(f"Request failed with status {response.status_code}: {response.text[:200]}")
+                return None
                 
         except Exception as e:
-            print(f"Error in {operation}: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning(f"Error in {operation}: {e}")
+            # Повний traceback лише в debug - при збоях проксі він множиться на кожну дію
+            if self.debug:
+                logger.exception(f"{operation} failed")
             
         return None
 
-    async def like_tweet(self, tweet_id: str) -> bool:
+    async def like_tweet(self, tweet_id: str, account=None) -> bool:
         """Like a tweet."""
         variables = {"tweet_id": str(tweet_id)}
-        result = await self._make_request("FavoriteTweet", variables)
+        result = await self._make_request("FavoriteTweet", variables, account=account)
         
         if result:
             # Перевіряємо різні можливі структури відповіді
             if "data" in result:
                 return True  # Якщо є секція data, вважаємо успішним
             elif "errors" in result:
-                print(f"Twitter API error: {result['errors']}")
+                logger.warning(f"Twitter API error: {result['errors']}")
                 return False
             else:
                 # Якщо структура незрозуміла, виводимо для дебагу
-                print(f"Unexpected response structure: {result}")
+                logger.warning(f"Unexpected response structure: {result}")
                 return True  # Оптимістично вважаємо успішним
             
         return False
 
-    async def unlike_tweet(self, tweet_id: str) -> bool:
+    async def unlike_tweet(self, tweet_id: str, account=None) -> bool:
         """Unlike a tweet."""
         variables = {"tweet_id": str(tweet_id)}
-        result = await self._make_request("UnfavoriteTweet", variables)
+        result = await self._make_request("UnfavoriteTweet", variables, account=account)
         
         if result:
             if "data" in result:
                 return True
             elif "errors" in result:
-                print(f"Twitter API error: {result['errors']}")
+                logger.warning(f"Twitter API error: {result['errors']}")
                 return False
             else:
                 return True
             
         return False
 
-    async def retweet(self, tweet_id: str) -> bool:
+    async def retweet(self, tweet_id: str, account=None) -> bool:
         """Retweet a tweet."""
         variables = {"tweet_id": str(tweet_id), "dark_request": False}
-        result = await self._make_request("CreateRetweet", variables)
+        result = await self._make_request("CreateRetweet", variables, account=account)
         
         if result:
             if "data" in result:
                 return True
             elif "errors" in result:
-                print(f"Twitter API error: {result['errors']}")
+                logger.warning(f"Twitter API error: {result['errors']}")
                 return False
             else:
                 return True
             
         return False
 
-    async def unretweet(self, tweet_id: str) -> bool:
+    async def unretweet(self, tweet_id: str, account=None) -> bool:
         """Unretweet a tweet."""
         variables = {"source_tweet_id": str(tweet_id), "dark_request": False}
-        result = await self._make_request("DeleteRetweet", variables)
+        result = await self._make_request("DeleteRetweet", variables, account=account)
         
         if result:
             if "data" in result:
                 return True
             elif "errors" in result:
-                print(f"Twitter API error: {result['errors']}")
+                logger.warning(f"Twitter API error: {result['errors']}")
                 return False
             else:
                 return True
             
         return False
 
-    async def follow_user(self, user_id: str) -> bool:
+    async def follow_user(self, user_id: str, account=None) -> bool:
         """Follow a user."""
         variables = {"user_id": str(user_id)}
-        result = await self._make_request("Follow", variables)
+        result = await self._make_request("Follow", variables, account=account)
         
-        if result and "data" in result:
-            return result["data"].get("follow", {}).get("user", {}) is not None
-            
-        return False
+        return _dig(result, "data", "follow", "user") is not None
 
-    async def unfollow_user(self, user_id: str) -> bool:
+    async def unfollow_user(self, user_id: str, account=None) -> bool:
         """Unfollow a user."""
         variables = {"user_id": str(user_id)}
-        result = await self._make_request("Unfollow", variables)
+        result = await self._make_request("Unfollow", variables, account=account)
         
-        if result and "data" in result:
-            return result["data"].get("unfollow", {}).get("user", {}) is not None
-            
-        return False
+        return _dig(result, "data", "unfollow", "user") is not None
+
+
+# Діапазони частки акаунтів (views, likes, retweets) для кожного типу контенту
+ENGAGEMENT_RATIOS = {
+    "viral": ((0.8, 0.95), (0.4, 0.7), (0.15, 0.3)),
+    "popular": ((0.6, 0.8), (0.25, 0.45), (0.08, 0.18)),
+    "normal": ((0.4, 0.6), (0.15, 0.3), (0.03, 0.1)),
+    "low": ((0.2, 0.4), (0.05, 0.15), (0.01, 0.05)),
+}
 
 
 class RealisticEngagement:
@@ -212,34 +311,19 @@ class RealisticEngagement:
         if self.total_accounts == 0:
             return {"views": 0, "likes": 0, "retweets": 0}
         
-        if engagement_type == "viral":
-            # Viral content
-            views_ratio = random.uniform(0.8, 0.95)
-            likes_ratio = random.uniform(0.4, 0.7)
-            retweets_ratio = random.uniform(0.15, 0.3)
-        elif engagement_type == "popular":
-            # Popular content
-            views_ratio = random.uniform(0.6, 0.8)
-            likes_ratio = random.uniform(0.25, 0.45)
-            retweets_ratio = random.uniform(0.08, 0.18)
-        elif engagement_type == "normal":
-            # Normal content
-            views_ratio = random.uniform(0.4, 0.6)
-            likes_ratio = random.uniform(0.15, 0.3)
-            retweets_ratio = random.uniform(0.03, 0.1)
-        elif engagement_type == "low":
-            # Low engagement
-            views_ratio = random.uniform(0.2, 0.4)
-            likes_ratio = random.uniform(0.05, 0.15)
-            retweets_ratio = random.uniform(0.01, 0.05)
-        else:  # auto
+        if engagement_type not in ENGAGEMENT_RATIOS:  # auto
             # Automatically determine based on account count
             if self.total_accounts > 50:
-                return self.calculate_engagement("popular")
+                engagement_type = "popular"
             elif self.total_accounts > 20:
-                return self.calculate_engagement("normal")
+                engagement_type = "normal"
             else:
-                return self.calculate_engagement("low")
+                engagement_type = "low"
+        
+        uniform = random.uniform
+        views_ratio, likes_ratio, retweets_ratio = (
+            uniform(low, high) for low, high in ENGAGEMENT_RATIOS[engagement_type]
+        )
         
         views = max(1, int(self.total_accounts * views_ratio))
         likes = max(1, int(self.total_accounts * likes_ratio))
@@ -258,38 +342,15 @@ class RealisticEngagement:
     
     def get_random_delays(self, action_count: int, min_delay: int = 5, max_delay: int = 60) -> list:
         """Generate random delays between actions for natural behavior."""
-        delays = []
-        for _ in range(action_count):
-            # Use exponential distribution for more realistic timing
-            delay = random.expovariate(1 / ((min_delay + max_delay) / 2))
-            delay = max(min_delay, min(max_delay, int(delay)))
-            delays.append(delay)
-        return delays
+        # Use exponential distribution for more realistic timing
+        rate = 1 / ((min_delay + max_delay) / 2)
+        draw = random.expovariate
+        return [max(min_delay, min(max_delay, int(draw(rate)))) for _ in range(action_count)]
     
     def shuffle_accounts(self, accounts: list, action_type: str = "view") -> list:
         """Shuffle accounts based on action type for realistic patterns."""
-        shuffled = accounts.copy()
-        random.shuffle(shuffled)
-        
-        # For different actions, use different patterns
-        if action_type == "like":
-            # Likes tend to come from more engaged users
-            # Put some accounts at the beginning more often
-            engaged_accounts = shuffled[:len(shuffled)//3]
-            other_accounts = shuffled[len(shuffled)//3:]
-            
-            # 70% chance to start with engaged accounts
-            if random.random() < 0.7:
-                return engaged_accounts + other_accounts
-            else:
-                return shuffled
-        elif action_type == "retweet":
-            # Retweets are more selective
-            # Randomize but ensure we get different accounts each time
-            return shuffled
-        else:  # views
-            # Views can be more random
-            return shuffled
+        # Для всіх типів дій порядок однаково випадковий; sample одразу повертає нову перетасовану копію
+        return random.sample(accounts, len(accounts))
 
 
 async def test_twitter_actions():
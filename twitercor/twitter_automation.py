@@ -6,17 +6,172 @@ This module extends the basic twscrape API to include interaction functionality.
 """
 
 import asyncio
+import atexit
+import functools
 import json
+import logging
+import logging.handlers
+import os
 import re
 import random
+import sys
+import time
+import zlib
+from collections import Counter
+from datetime import date
+from queue import SimpleQueue
 from typing import Dict, List, Optional
 from urllib.parse import urlparse, parse_qs
 
-from twscrape.api import API, GQL_URL, GQL_FEATURES
+try:
+    import orjson
+except ImportError:  # orjson - необов'язкове прискорення, є запасний варіант на json
+    orjson = None
+
+from twscrape.api import API, GQL_URL, GQL_FEATURES, OP_TweetDetail
 from twscrape.queue_client import QueueClient
 from twscrape.utils import encode_params
-from twitter_actions import TwitterActionsAPI
+from twitter_actions import TwitterActionsAPI, set_per_host_limit
 from fast_twitter_actions import FastTwitterActionsAPI
+from runtime import env_number
+
+# Рядки про окремі дії йдуть через чергу в окремий потік: воркери не чекають на stdout
+log = logging.getLogger("xfarmm.twitter")
+_log_queue = SimpleQueue()
+log.addHandler(logging.handlers.QueueHandler(_log_queue))
+log.setLevel(logging.INFO)
+log.propagate = False
+_log_listener = None
+
+
+def _start_log_listener():
+    """Start the thread that prints queued action messages (once per process)."""
+    global _log_listener
+    if _log_listener is not None:
+        return
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    handler.addFilter(_flush_marker_filter)
+    _log_listener = logging.handlers.QueueListener(_log_queue, handler)
+    _log_listener.start()
+    # Дописуємо залишок черги перед виходом
+    atexit.register(_log_listener.stop)
+
+
+def _flush_marker_filter(record: logging.LogRecord) -> bool:
+    """Let normal records through; a flush marker only reports that it was reached."""
+    reached = getattr(record, "flush_reached", None)
+    if reached is None:
+        return True
+    reached()
+    return False
+
+
+async def _flush_log_listener():
+    """Wait until every action message queued so far has been printed."""
+    if _log_listener is None:
+        return
+    loop = asyncio.get_running_loop()
+    done = loop.create_future()
+    
+    def reached():
+        try:
+            loop.call_soon_threadsafe(lambda: done.done() or done.set_result(None))
+        except RuntimeError:  # цикл уже закрито
+            pass
+    
+    # Маркер стає в чергу за нашими рядками: потік слухача дійде до нього, лише надрукувавши їх,
+    # а event loop тим часом не блокується (інші завдання працюють далі)
+    _log_queue.put(logging.makeLogRecord({"flush_reached": reached}))
+    await done
+
+
+# На скільки когорт ділимо акаунти для переглядів в автоматичному режимі (одна когорта на день)
+VIEW_COHORTS = 7
+
+
+def in_todays_view_cohort(username: str, cycle: int = VIEW_COHORTS) -> bool:
+    """Check whether the account belongs to today's view cohort."""
+    # crc32 замість hash(): hash рядків солиться між запусками і когорти б перемішувались
+    return zlib.crc32(username.encode()) % cycle == date.today().toordinal() % cycle
+
+
+# Для кожного типу дії: ключ у results["actions"] і слова для повідомлень
+ACTION_LABELS = {
+    "like": ("likes", "liked", "like", "liking"),
+    "retweet": ("retweets", "retweeted", "retweet", "retweeting"),
+    "view": ("views", "viewed", "view", "viewing"),
+}
+# Метод TwitterActionsAPI для дії; перегляд іде через TwitterInteractionAPI.view_tweet (запит деталей твіта)
+_ACTION_DISPATCH = {"like": "like_tweet", "retweet": "retweet"}
+# Випадкова пауза (секунди) перед дією, окремо для кожного типу
+ACTION_DELAYS = {"like": (2, 8), "retweet": (3, 12), "view": (1, 5)}
+# Змінні TweetDetail для перегляду: без усього, що роздуває відповідь
+VIEW_DETAIL_FLAGS = {
+    "with_rux_injections": False,
+    "includePromotedContent": False,
+    "withCommunity": False,
+    "withQuickPromoteEligibilityTweetFields": False,
+    "withBirdwatchNotes": False,
+    "withVoice": False,
+    "withV2Timeline": False,
+}
+# Параметри запиту перегляду серіалізуємо один раз; на кожен виклик підставляємо лише id твіта
+_VIEW_ID_PLACEHOLDER = "__TWEET_ID__"
+_VIEW_PARAMS = encode_params({
+    "variables": {"focalTweetId": _VIEW_ID_PLACEHOLDER, **VIEW_DETAIL_FLAGS},
+    "features": GQL_FEATURES,
+})
+# Скільки секунд тримаємо в пам'яті список активних акаунтів
+ACTIVE_ACCOUNTS_TTL = 30.0
+
+
+# Various Twitter URL formats:
+# https://x.com/username/status/1234567890
+# https://twitter.com/username/status/1234567890
+# https://x.com/i/status/1234567890
+_TWEET_ID_RE = re.compile(r'(?:twitter\.com|x\.com)/.+/status/(\d+)')
+
+
+@functools.lru_cache(maxsize=4096)
+def _extract_tweet_id(url: str) -> Optional[str]:
+    """Tweet ID from a URL or a bare ID; cached since the same links get forwarded repeatedly."""
+    match = _TWEET_ID_RE.search(url)
+    if match:
+        return match.group(1)
+    
+    # If it's just a number, assume it's already a tweet ID
+    if url.isdigit():
+        return url
+        
+    return None
+
+
+# Файл з прив'язкою акаунтів до проксі: username -> проксі
+PROXIES_FILE = "proxies.json"
+# Розібраний proxies.json, спільний для всіх TwitterInteractionAPI: ((шлях, mtime), дані)
+_proxies_cache = None
+
+
+def get_account_proxies(path: str = PROXIES_FILE) -> Dict[str, str]:
+    """Parsed proxies.json, re-read only when its mtime changes ({} if missing or broken)."""
+    global _proxies_cache
+    try:
+        key = (path, os.stat(path).st_mtime_ns)
+    except OSError:
+        return {}
+    
+    if _proxies_cache is not None and _proxies_cache[0] == key:
+        return _proxies_cache[1]
+    
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+        proxies = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except (OSError, ValueError):
+        proxies = {}
+    _proxies_cache = (key, proxies)
+    return proxies
 
 
 class TwitterInteractionAPI:
@@ -26,63 +181,41 @@ class TwitterInteractionAPI:
         self.debug = api.debug
         self.proxy = api.proxy
         self.actions = TwitterActionsAPI(self.pool, debug=self.debug, proxy=self.proxy)
-        # Завантажуємо проксі для акаунтів
-        self.account_proxies = self._load_account_proxies()
+        # Один TwitterActionsAPI на акаунт: username -> API з його проксі
+        self._actions_cache: Dict[str, TwitterActionsAPI] = {}
+        # API для переглядів: проксі -> twscrape API
+        self._view_apis: Dict[str, API] = {}
     
-    def _load_account_proxies(self) -> Dict[str, str]:
-        """Load proxy assignments for accounts."""
-        import os
-        import json
-        
-        proxy_file = "proxies.json"
-        if os.path.exists(proxy_file):
-            try:
-                with open(proxy_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
+    @property
+    def account_proxies(self) -> Dict[str, str]:
+        """Current proxies.json assignments (re-read only after the file changes)."""
+        return get_account_proxies()
     
     def get_account_proxy(self, username: str) -> Optional[str]:
         """Get proxy for specific account."""
-        return self.account_proxies.get(username, None)
+        return get_account_proxies().get(username)
     
     def create_actions_api_for_account(self, username: str) -> TwitterActionsAPI:
-        """Create TwitterActionsAPI instance with account's proxy."""
-        account_proxy = self.get_account_proxy(username)
-        if self.debug and account_proxy:
-            print(f"🌐 Using proxy for @{username}: {account_proxy}")
-        return TwitterActionsAPI(self.pool, debug=self.debug, proxy=account_proxy)
+        """TwitterActionsAPI with the account's proxy, created once per account."""
+        account_proxy = get_account_proxies().get(username)
+        actions = self._actions_cache.get(username)
+        # Проксі акаунта змінили в proxies.json - створюємо API заново
+        if actions is None or actions.proxy != account_proxy:
+            if self.debug and account_proxy:
+                print(f"🌐 Using proxy for @{username}: {account_proxy}")
+            actions = self._actions_cache[username] = TwitterActionsAPI(self.pool, debug=self.debug, proxy=account_proxy)
+        return actions
 
     def extract_tweet_id(self, url: str) -> Optional[str]:
         """Extract tweet ID from Twitter URL."""
-        # Various Twitter URL formats:
-        # https://x.com/username/status/1234567890
-        # https://twitter.com/username/status/1234567890
-        # https://x.com/i/status/1234567890
-        patterns = [
-            r'(?:twitter\.com|x\.com)/.+/status/(\d+)',
-            r'(?:twitter\.com|x\.com)/i/status/(\d+)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                return match.group(1)
-        
-        # If it's just a number, assume it's already a tweet ID
-        if url.isdigit():
-            return url
-            
-        return None
+        return _extract_tweet_id(url)
 
     async def like_tweet(self, tweet_id: str, username: str = None) -> bool:
         """Like a tweet using a specific account or random account."""
         try:
-            # Створюємо окремий екземпляр TwitterActionsAPI з проксі для конкретного акаунта
+            # Окремий екземпляр TwitterActionsAPI з проксі для конкретного акаунта
             if username:
-                account_proxy = self.get_account_proxy(username)
-                actions = TwitterActionsAPI(self.pool, debug=self.debug, proxy=account_proxy)
+                actions = self.create_actions_api_for_account(username)
             else:
                 actions = self.actions
                 
@@ -95,8 +228,7 @@ class TwitterInteractionAPI:
         """Unlike a tweet using a specific account or random account."""
         try:
             if username:
-                account_proxy = self.get_account_proxy(username)
-                actions = TwitterActionsAPI(self.pool, debug=self.debug, proxy=account_proxy)
+                actions = self.create_actions_api_for_account(username)
             else:
                 actions = self.actions
                 
@@ -109,8 +241,7 @@ class TwitterInteractionAPI:
         """Retweet a tweet using a specific account or random account."""
         try:
             if username:
-                account_proxy = self.get_account_proxy(username)
-                actions = TwitterActionsAPI(self.pool, debug=self.debug, proxy=account_proxy)
+                actions = self.create_actions_api_for_account(username)
             else:
                 actions = self.actions
                 
@@ -119,46 +250,11 @@ class TwitterInteractionAPI:
             print(f"Error retweeting tweet {tweet_id}: {e}")
             return False
 
-    async def view_tweet(self, tweet_id: str, username: str = None) -> bool:
-        """View a tweet using a specific account."""
-        try:
-            # Для перегляду достатньо просто отримати детальну інформацію про твіт
-            if username:
-                account_proxy = self.get_account_proxy(username)
-                # Створюємо тимчасовий API з проксі акаунта
-                api = API(self.pool, debug=self.debug, proxy=account_proxy)
-            else:
-                api = self.api
-                
-            # Отримуємо твіт через TweetDetail API (це рахується як перегляд)
-            try:
-                # Використовуємо той самий метод що і get_tweet_stats
-                tweet_data = await api._gql_item(
-                    "_8aYOgEDz35BrBcBal1-_w/TweetDetail",
-                    {"focalTweetId": str(tweet_id), "with_rux_injections": True,
-                     "includePromotedContent": True, "withCommunity": True,
-                     "withQuickPromoteEligibilityTweetFields": True,
-                     "withBirdwatchNotes": True, "withVoice": True,
-                     "withV2Timeline": True}
-                )
-                
-                if tweet_data and tweet_data.status_code == 200:
-                    return True
-                else:
-                    return False
-                    
-            except Exception:
-                return False
-                
-        except Exception as e:
-            if self.debug:
-                print(f"Error viewing tweet {tweet_id}: {e}")
-            return False
+    async def unretweet(self, tweet_id: str, username: str = None) -> bool:
         """Unretweet a tweet using a specific account or random account."""
         try:
             if username:
-                account_proxy = self.get_account_proxy(username)
-                actions = TwitterActionsAPI(self.pool, debug=self.debug, proxy=account_proxy)
+                actions = self.create_actions_api_for_account(username)
             else:
                 actions = self.actions
                 
@@ -167,12 +263,26 @@ class TwitterInteractionAPI:
             print(f"Error unretweeting tweet {tweet_id}: {e}")
             return False
 
+    def _api_for_account(self, username: str) -> API:
+        """twscrape API routed through the account's proxy, one per proxy."""
+        account_proxy = get_account_proxies().get(username)
+        if account_proxy is None:
+            return self.api
+        api = self._view_apis.get(account_proxy)
+        if api is None:
+            api = self._view_apis[account_proxy] = API(self.pool, debug=self.debug, proxy=account_proxy)
+        return api
+
     async def view_tweet(self, tweet_id: str, username: str = None) -> bool:
         """View a tweet (increase view count) using a specific account or random account."""
         try:
-            # Getting tweet details counts as a view
-            tweet = await self.api.tweet_details(int(tweet_id))
-            return tweet is not None
+            api = self._api_for_account(username) if username else self.api
+            # Getting tweet details counts as a view; важкі частини відповіді (гілки відповідей,
+            # нотатки, промо) вимикаємо, а тіло навіть не розбираємо - потрібен лише статус
+            params = {**_VIEW_PARAMS, "variables": _VIEW_PARAMS["variables"].replace(_VIEW_ID_PLACEHOLDER, str(int(tweet_id)))}
+            async with QueueClient(api.pool, "TweetDetail", api.debug, proxy=api.proxy) as client:
+                rep = await client.get(f"{GQL_URL}/{OP_TweetDetail}", params=params)
+            return rep is not None and rep.status_code == 200
             
         except Exception as e:
             print(f"Error viewing tweet {tweet_id}: {e}")
@@ -188,226 +298,221 @@ class TwitterInteractionAPI:
                     "likes": tweet.likeCount,
                     "retweets": tweet.retweetCount,
                     "replies": tweet.replyCount,
-                    "views": tweet.viewCount if hasattr(tweet, 'viewCount') else 0,
-                    "quotes": tweet.quoteCount if hasattr(tweet, 'quoteCount') else 0
+                    "views": getattr(tweet, 'viewCount', 0),
+                    "quotes": getattr(tweet, 'quoteCount', 0)
                 }
         except Exception as e:
             print(f"Error getting tweet stats {tweet_id}: {e}")
             
         return None
 
+    async def get_tweet_stats_many(self, tweet_ids: List[str]) -> List[Optional[Dict]]:
+        """Get stats for several tweets concurrently, None for the ones that failed."""
+        results = await asyncio.gather(*(self.get_tweet_stats(tid) for tid in tweet_ids), return_exceptions=True)
+        return [None if isinstance(r, BaseException) else r for r in results]
+
 
 class TwitterAutomation:
     """Main automation class for managing multiple accounts and interactions."""
     
-    def __init__(self, api: API, fast_mode: bool = True):
+    def __init__(self, api: API, fast_mode: bool = True, max_concurrent_workers: int = None,
+                 per_host_limit: int = None):
         self.api = api
         self.interaction_api = TwitterInteractionAPI(api)
         self.fast_mode = fast_mode
+        # Скільки дій виконуємо одночасно (за замовчуванням ACTION_CONCURRENCY у config.env)
+        if max_concurrent_workers is None:
+            max_concurrent_workers = env_number("ACTION_CONCURRENCY", 5)
+        self.max_concurrent_workers = max(1, max_concurrent_workers)
+        # Реальне обмеження - пул з'єднань клієнта на проксі
+        if per_host_limit is not None:
+            set_per_host_limit(per_host_limit)
+        # Кеш списку активних акаунтів: (час monotonic, usernames)
+        self._active_accounts_cache = None
+        # Спільний FastTwitterActionsAPI для швидкого режиму, створюється при першій дії
+        self._fast_api: Optional[FastTwitterActionsAPI] = None
         
-    def create_actions_api_for_account(self, username: str):
-        """Create an API instance with the specific proxy for the account."""
-        account_proxy = self.interaction_api.get_account_proxy(username)
+    def _get_fast_api(self) -> FastTwitterActionsAPI:
+        """FastTwitterActionsAPI used in fast mode, with the current proxies.json."""
+        if self._fast_api is None:
+            self._fast_api = FastTwitterActionsAPI(self.api.pool)
+        # proxies.json могли змінити в меню проксі між завданнями
+        self._fast_api.account_proxies = get_account_proxies()
+        return self._fast_api
+    
+    async def aclose(self):
+        """Save fast-mode pacing state and close its HTTP clients."""
+        fast_api, self._fast_api = self._fast_api, None
+        if fast_api is not None:
+            await fast_api.aclose()
         
+    def create_actions_api_for_account(self, username: str):
+        """API instance with the specific proxy for the account (cached per account)."""
         # Використовуємо стандартний TwitterActionsAPI який працював з проксі
-        return TwitterActionsAPI(self.api.pool, debug=self.api.debug, proxy=account_proxy)
+        return self.interaction_api.create_actions_api_for_account(username)
         
     async def get_active_accounts(self) -> List[str]:
-        """Get list of active account usernames."""
+        """Get list of active account usernames (cached for ACTIVE_ACCOUNTS_TTL seconds)."""
+        cached = self._active_accounts_cache
+        if cached is not None and time.monotonic() - cached[0] < ACTIVE_ACCOUNTS_TTL:
+            return list(cached[1])
+        
         accounts_info = await self.api.pool.accounts_info()
-        return [acc["username"] for acc in accounts_info if acc["active"]]
+        accounts = [acc["username"] for acc in accounts_info if acc["active"]]
+        self._active_accounts_cache = (time.monotonic(), accounts)
+        return list(accounts)
+    
+    def invalidate_accounts_cache(self):
+        """Forget the cached active accounts (call after changing the pool)."""
+        self._active_accounts_cache = None
+
+    async def _action_worker(self, queue: asyncio.Queue, tweet_id: str, results: Dict):
+        """Run queued (index, action, account, call) jobs until the queue is empty."""
+        actions = results["actions"]
+        while True:
+            try:
+                index, action, account, call = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return  # Черга заповнена заздалегідь - порожня означає кінець
+            
+            key, done_text, verb, gerund = ACTION_LABELS[action]
+            try:
+                # Додаємо затримку перед дією для реалістичності (крім найпершої)
+                if index > 0:
+                    await asyncio.sleep(random.randint(*ACTION_DELAYS[action]))
+                
+                success = await call(tweet_id)
+                if success:
+                    actions[key] += 1
+                    log.info("✅ @%s %s the tweet", account, done_text)
+                else:
+                    log.info("❌ @%s failed to %s the tweet", account, verb)
+                    results["errors"].append(f"{verb.capitalize()} failed for @{account}")
+                    
+            except Exception as e:
+                log.info("❌ Error with @%s %s: %s", account, gerund, e)
+                results["errors"].append(f"{verb.capitalize()} error for @{account}: {e}")
 
     async def process_tweet_url(self, tweet_url: str, likes_count: int = None, 
-                               retweets_count: int = None, views_count: int = None) -> Dict:
+                               retweets_count: int = None, views_count: int = None,
+                               views_cohort: bool = False) -> Dict:
         """Process a tweet URL with specified engagement numbers."""
-        
+        try:
+            return await self._process_tweet_url(tweet_url, likes_count, retweets_count,
+                                                 views_count, views_cohort)
+        finally:
+            # Викликач друкує підсумок через print - черга логера має спорожніти раніше
+            await _flush_log_listener()
+
+    async def _process_tweet_url(self, tweet_url: str, likes_count: int, retweets_count: int,
+                                 views_count: int, views_cohort: bool) -> Dict:
+        """Body of process_tweet_url; its messages go through the queued logger."""
         tweet_id = self.interaction_api.extract_tweet_id(tweet_url)
         if not tweet_id:
             return {"error": "Invalid tweet URL"}
         
-        print(f"🎯 Processing tweet: {tweet_url}")
-        print(f"📊 Tweet ID: {tweet_id}")
+        # Не задана кількість - 0 (інакше підсумок падав на None + int)
+        likes_count = max(0, likes_count or 0)
+        retweets_count = max(0, retweets_count or 0)
+        views_count = max(0, views_count or 0)
         
-        # Get initial stats
-        initial_stats = await self.interaction_api.get_tweet_stats(tweet_id)
-        if initial_stats:
-            print(f"📈 Initial stats: {initial_stats}")
+        _start_log_listener()
         
-        active_accounts = await self.get_active_accounts()
+        # Get initial stats - паралельно зі списком акаунтів, запити незалежні
+        initial_stats, active_accounts = await asyncio.gather(
+            self.interaction_api.get_tweet_stats(tweet_id),
+            self.get_active_accounts(),
+            return_exceptions=True
+        )
+        if isinstance(initial_stats, Exception):
+            # Без початкової статистики обробку все одно продовжуємо
+            log.info("Error getting tweet stats %s: %s", tweet_id, initial_stats)
+            initial_stats = None
+        log.info("🎯 Processing tweet: %s (ID %s), initial stats: %s",
+                 tweet_url, tweet_id, initial_stats or "unavailable")
+        
+        if isinstance(active_accounts, Exception):
+            raise active_accounts
         if not active_accounts:
             return {"error": "No active accounts available"}
         
-        print(f"👥 Available accounts: {len(active_accounts)}")
-        
         results = {
             "tweet_id": tweet_id,
             "tweet_url": tweet_url,
             "initial_stats": initial_stats,
-            "actions": {
-                "likes": 0,
-                "retweets": 0,
-                "views": 0
-            },
+            # Counter - звичайний dict для викликачів, але з інкрементом в один пошук
+            "actions": Counter(likes=0, retweets=0, views=0),
             "errors": []
         }
         
-        # Shuffle accounts for more realistic behavior
-        shuffled_accounts = active_accounts.copy()
-        random.shuffle(shuffled_accounts)
+        # Лайки і ретвіти - від різних акаунтів: одна вибірка без повторень на обидві дії,
+        # а не перетасування всього списку (random.sample обирає лише k акаунтів)
+        picked = random.sample(active_accounts, min(likes_count + retweets_count, len(active_accounts)))
+        likes_accounts = picked[:likes_count]
+        retweet_accounts = picked[likes_count:]
+        view_accounts = []
         
-        # Initialize account lists
-        likes_accounts = []
-        retweet_accounts = []
+        # Акаунти, вже задіяні в інших діях (set - перевірка входження за O(1))
+        used_accounts = set(picked)
         
-        # Process likes with parallel execution (max 5 concurrent)
-        if likes_count and likes_count > 0:
-            print(f"❤️ Adding {likes_count} likes (parallel processing with max 5 concurrent)...")
-            likes_accounts = shuffled_accounts[:min(likes_count, len(shuffled_accounts))]
-            
-            # Виконуємо лайки паралельно групами по 5
-            semaphore = asyncio.Semaphore(5)  # Максимум 5 одночасних операцій
-            
-            async def process_like(account, index):
-                async with semaphore:
-                    try:
-                        # Додаємо затримку перед першою дією для реалістичності
-                        if index > 0:
-                            delay = random.randint(2, 8)
-                            await asyncio.sleep(delay)
-                        
-                        # Створюємо окремий API з проксі для цього акаунта
-                        actions_api = self.create_actions_api_for_account(account)
-                        success = await actions_api.like_tweet(tweet_id)
-                        
-                        if success:
-                            results["actions"]["likes"] += 1
-                            print(f"✅ @{account} liked the tweet")
-                            return True
-                        else:
-                            print(f"❌ @{account} failed to like the tweet")
-                            results["errors"].append(f"Like failed for @{account}")
-                            return False
-                            
-                    except Exception as e:
-                        print(f"❌ Error with @{account} liking: {e}")
-                        results["errors"].append(f"Like error for @{account}: {e}")
-                        return False
-            
-            # Запускаємо всі лайки паралельно
-            like_tasks = [process_like(account, i) for i, account in enumerate(likes_accounts)]
-            await asyncio.gather(*like_tasks, return_exceptions=True)
-            
-            # Додаємо затримку між групами операцій
-            if retweets_count or views_count:
-                delay = random.randint(5, 15)
-                print(f"⏳ Waiting {delay} seconds before next operation group...")
-                await asyncio.sleep(delay)
+        if views_count > 0:
+            # All accounts can view
+            candidates = [
+                acc for acc in active_accounts
+                if acc not in used_accounts and (not views_cohort or in_todays_view_cohort(acc))
+            ]
+            view_accounts = random.sample(candidates, min(views_count, len(candidates)))
+            if views_cohort:
+                # Сьогодні переглядає лише одна когорта акаунтів
+                views_count = len(view_accounts)
         
-        # Process retweets with parallel execution (max 5 concurrent)
-        if retweets_count and retweets_count > 0:
-            print(f"🔄 Adding {retweets_count} retweets (parallel processing with max 5 concurrent)...")
-            # Use different accounts for retweets
-            used_accounts = likes_accounts if likes_count else []
-            remaining_accounts = [acc for acc in shuffled_accounts if acc not in used_accounts]
-            retweet_accounts = remaining_accounts[:min(retweets_count, len(remaining_accounts))]
-            
-            # Виконуємо ретвіти паралельно групами по 5
-            semaphore = asyncio.Semaphore(5)
-            
-            async def process_retweet(account, index):
-                async with semaphore:
-                    try:
-                        # Додаємо затримку для реалістичності
-                        if index > 0:
-                            delay = random.randint(3, 12)
-                            await asyncio.sleep(delay)
-                        
-                        # Створюємо окремий API з проксі для цього акаунта
-                        actions_api = self.create_actions_api_for_account(account)
-                        success = await actions_api.retweet(tweet_id)
-                        
-                        if success:
-                            results["actions"]["retweets"] += 1
-                            print(f"✅ @{account} retweeted the tweet")
-                            return True
-                        else:
-                            print(f"❌ @{account} failed to retweet the tweet")
-                            results["errors"].append(f"Retweet failed for @{account}")
-                            return False
-                            
-                    except Exception as e:
-                        print(f"❌ Error with @{account} retweeting: {e}")
-                        results["errors"].append(f"Retweet error for @{account}: {e}")
-                        return False
-            
-            # Запускаємо всі ретвіти паралельно
-            retweet_tasks = [process_retweet(account, i) for i, account in enumerate(retweet_accounts)]
-            await asyncio.gather(*retweet_tasks, return_exceptions=True)
-            
-            # Додаємо затримку перед переглядами
-            if views_count:
-                delay = random.randint(3, 10)
-                print(f"⏳ Waiting {delay} seconds before views...")
-                await asyncio.sleep(delay)
+        # Усі дії - одна черга: типи перемішані, як у живих користувачів, і воркери
+        # не простоюють між групами лайків/ретвітів/переглядів
+        jobs = ([("like", acc) for acc in likes_accounts]
+                + [("retweet", acc) for acc in retweet_accounts]
+                + [("view", acc) for acc in view_accounts])
+        random.shuffle(jobs)
+        # Швидкий режим: лайки/ретвіти йдуть через FastTwitterActionsAPI з власними затримками,
+        # стандартний - через TwitterActionsAPI з затримками twscrape
+        fast_api = self._get_fast_api() if self.fast_mode else None
+        # API кожного учасника готуємо один раз, а не в кожній дії (proxies.json перевіряється тут)
+        per_account_api = {} if fast_api else {acc: self.create_actions_api_for_account(acc) for acc in used_accounts}
+        queue = asyncio.Queue()
+        for index, (action, account) in enumerate(jobs):
+            method = _ACTION_DISPATCH.get(action)
+            if method:
+                call = getattr(fast_api or per_account_api[account], method)
+            else:
+                call = functools.partial(self.interaction_api.view_tweet, username=account)
+            queue.put_nowait((index, action, account, call))
         
-        # Process views with parallel execution (max 5 concurrent)
-        if views_count and views_count > 0:
-            print(f"👀 Adding {views_count} views (parallel processing with max 5 concurrent)...")
-            # All accounts can view
-            used_accounts_set = set(likes_accounts + retweet_accounts)
-            view_accounts = [acc for acc in shuffled_accounts if acc not in used_accounts_set][:min(views_count, len(shuffled_accounts))]
-            
-            # Виконуємо перегляди паралельно групами по 5
-            semaphore = asyncio.Semaphore(5)
-            
-            async def process_view(account, index):
-                async with semaphore:
-                    try:
-                        # Додаємо мінімальну затримку для переглядів
-                        if index > 0:
-                            delay = random.randint(1, 5)
-                            await asyncio.sleep(delay)
-                        
-                        # Створюємо окремий API з проксі для цього акаунта
-                        actions_api = self.create_actions_api_for_account(account)
-                        success = await actions_api.view_tweet(tweet_id)
-                        
-                        if success:
-                            results["actions"]["views"] += 1
-                            print(f"✅ @{account} viewed the tweet")
-                            return True
-                        else:
-                            print(f"❌ @{account} failed to view the tweet")
-                            results["errors"].append(f"View failed for @{account}")
-                            return False
-                            
-                    except Exception as e:
-                        print(f"❌ Error with @{account} viewing: {e}")
-                        results["errors"].append(f"View error for @{account}: {e}")
-                        return False
-                        return False
-            
-            # Запускаємо всі перегляди паралельно
-            view_tasks = [process_view(account, i) for i, account in enumerate(view_accounts)]
-            await asyncio.gather(*view_tasks, return_exceptions=True)
+        concurrency = self.max_concurrent_workers
+        # Один рядок з планом замість окремого повідомлення на кожну групу дій
+        log.info("🚀 Running %d actions with %d accounts available: ❤️ %d likes, 🔄 %d retweets, 👀 %d views%s (max %d concurrent)",
+                 len(jobs), len(active_accounts), len(likes_accounts), len(retweet_accounts), len(view_accounts),
+                 " (today's view cohort)" if views_cohort else "", concurrency)
+        
+        await asyncio.gather(*(self._action_worker(queue, tweet_id, results)
+                               for _ in range(min(concurrency, len(jobs)))))
         
         # Get final stats
         final_stats = await self.interaction_api.get_tweet_stats(tweet_id)
         if final_stats:
-            print(f"📊 Final stats: {final_stats}")
+            log.info("📊 Final stats: %s", final_stats)
             results["final_stats"] = final_stats
         
-        print(f"✅ Processing complete!")
-        print(f"📈 Actions performed: {results['actions']}")
+        # Підсумок - через ту саму чергу, щоб не обігнати рядки про окремі дії
+        log.info("✅ Processing complete!")
+        log.info("📈 Actions performed: %s", dict(results['actions']))
         
         # Додаткова статистика
         total_errors = len(results['errors'])
         total_attempts = likes_count + retweets_count + views_count
-        success_rate = ((results['actions']['likes'] + results['actions']['retweets'] + results['actions']['views']) / total_attempts * 100) if total_attempts > 0 else 0
+        success_rate = sum(results['actions'].values()) / total_attempts * 100 if total_attempts > 0 else 0
         
-        print(f"📊 Success rate: {success_rate:.1f}%")
+        log.info("📊 Success rate: %.1f%%", success_rate)
         if total_errors > 0:
-            print(f"⚠️ Errors: {total_errors}")
+            log.info("⚠️ Errors: %d", total_errors)
         
         return results
 
@@ -436,4 +541,4 @@ class TwitterAutomation:
         print(f"❤️ Likes: {likes_count}")
         print(f"🔄 Retweets: {retweets_count}")
         
-        return await self.process_tweet_url(tweet_url, likes_count, retweets_count, views_count)
\ No newline at end of file
+        return await self.process_tweet_url(tweet_url, likes_count, retweets_count, views_count, views_cohort=True)
\ No newline at end of file
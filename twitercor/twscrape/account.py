@@ -1,16 +1,85 @@
+import asyncio
+import importlib.util
 import json
 import os
 import sqlite3
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
 
-from httpx import AsyncClient, AsyncHTTPTransport
+from httpx import AsyncBaseTransport, AsyncClient, AsyncHTTPTransport, Limits
 
 from .models import JSONTrait
 from .utils import utc
 
 TOKEN = "Bearer AAAAAAAAAAAAAAAAAAAAANRILgAAAAAAnNwIzUejRCOuH5E6I8xnZz4puTs%3D1Zv7ttfk8LF81IUq16cHjhLTvJu4FA33AGWWjCpTnA"
 
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+# idle connections are kept this long (httpx default is 5s), so bursts rarely re-resolve and re-handshake
+KEEPALIVE_EXPIRY = 120.0
+
+
+class _SharedTransport(AsyncBaseTransport):
+    """Connection pool that outlives the per-account clients using it."""
+
+    def __init__(self, transport: AsyncHTTPTransport):
+        self.transport = transport
+
+    async def handle_async_request(self, request):
+        return await self.transport.handle_async_request(request)
+
+    async def aclose(self):
+        # clients are closed after every queue ctx; the pool is closed by close_shared_transports()
+        pass
+
+
+_shared_transports: dict[str | None, _SharedTransport] = {}
+_shared_loop: asyncio.AbstractEventLoop | None = None
+# closing tasks for pools left behind by a previous loop (kept so they are not garbage collected)
+_closing: set[asyncio.Task] = set()
+
+
+async def _close_quietly(transports):
+    for x in transports:
+        try:
+            await x.transport.aclose()
+        except Exception:
+            # sockets opened in a closed loop cannot always be shut down cleanly
+            pass
+
+
+def _get_transport(proxy: str | None) -> AsyncBaseTransport:
+    global _shared_loop, _shared_transports
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return AsyncHTTPTransport(retries=3, proxy=proxy)
+
+    # connections are bound to the loop they were opened in
+    if loop is not _shared_loop:
+        stale = list(_shared_transports.values())
+        _shared_loop, _shared_transports = loop, {}
+        if stale:
+            task = loop.create_task(_close_quietly(stale))
+            _closing.add(task)
+            task.add_done_callback(_closing.discard)
+
+    if proxy not in _shared_transports:
+        transport = AsyncHTTPTransport(
+            retries=3,
+            proxy=proxy,
+            http2=HTTP2_AVAILABLE,
+            limits=Limits(max_keepalive_connections=20, keepalive_expiry=KEEPALIVE_EXPIRY),
+        )
+        _shared_transports[proxy] = _SharedTransport(transport)
+    return _shared_transports[proxy]
+
+
+async def close_shared_transports():
+    global _shared_transports
+    transports, _shared_transports = _shared_transports, {}
+    await _close_quietly(transports.values())
+
 
 @dataclass
 class Account(JSONTrait):
@@ -55,8 +124,8 @@ class Account(JSONTrait):
         proxies = [x for x in proxies if x is not None]
         proxy = proxies[0] if proxies else None
 
-        transport = AsyncHTTPTransport(retries=3)
-        client = AsyncClient(proxy=proxy, follow_redirects=True, transport=transport)
+        # connection pool is shared between clients, so TCP/TLS is not repeated on every request
+        client = AsyncClient(follow_redirects=True, transport=_get_transport(proxy))
 
         # saved from previous usage
         client.cookies.update(self.cookies)
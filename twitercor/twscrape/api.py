@@ -7,7 +7,7 @@ from .accounts_pool import AccountsPool
 from .logger import set_log_level
 from .models import Tweet, User, parse_trends, parse_tweet, parse_tweets, parse_user, parse_users
 from .queue_client import QueueClient
-from .utils import encode_params, find_obj, get_by_path
+from .utils import encode_params, find_obj, get_by_path, rep_json
 
 # OP_{NAME} – {NAME} should be same as second part of GQL ID (required to auto-update script)
 OP_SearchTimeline = "AIdc203rPpK_k_2KWSdm7g/SearchTimeline"
@@ -132,7 +132,7 @@ class API:
                 if rep is None:
                     return
 
-                obj = rep.json()
+                obj = rep_json(rep)
                 els = get_by_path(obj, "entries") or []
                 els = [
                     x
@@ -175,14 +175,14 @@ class API:
     async def search(self, q: str, limit=-1, kv: KV = None):
         async with aclosing(self.search_raw(q, limit=limit, kv=kv)) as gen:
             async for rep in gen:
-                for x in parse_tweets(rep.json(), limit):
+                for x in parse_tweets(rep_json(rep), limit):
                     yield x
 
     async def search_user(self, q: str, limit=-1, kv: KV = None):
         kv = {"product": "People", **(kv or {})}
         async with aclosing(self.search_raw(q, limit=limit, kv=kv)) as gen:
             async for rep in gen:
-                for x in parse_users(rep.json(), limit):
+                for x in parse_users(rep_json(rep), limit):
                     yield x
 
     # user_by_id
@@ -274,7 +274,7 @@ class API:
     async def tweet_replies(self, twid: int, limit=-1, kv: KV = None):
         async with aclosing(self.tweet_replies_raw(twid, limit=limit, kv=kv)) as gen:
             async for rep in gen:
-                for x in parse_tweets(rep.json(), limit):
+                for x in parse_tweets(rep_json(rep), limit):
                     if x.inReplyToTweetId == twid:
                         yield x
 
@@ -291,7 +291,7 @@ class API:
     async def followers(self, uid: int, limit=-1, kv: KV = None):
         async with aclosing(self.followers_raw(uid, limit=limit, kv=kv)) as gen:
             async for rep in gen:
-                for x in parse_users(rep.json(), limit):
+                for x in parse_users(rep_json(rep), limit):
                     yield x
 
     # verified_followers
@@ -309,7 +309,7 @@ class API:
     async def verified_followers(self, uid: int, limit=-1, kv: KV = None):
         async with aclosing(self.verified_followers_raw(uid, limit=limit, kv=kv)) as gen:
             async for rep in gen:
-                for x in parse_users(rep.json(), limit):
+                for x in parse_users(rep_json(rep), limit):
                     yield x
 
     # following
@@ -324,7 +324,7 @@ class API:
     async def following(self, uid: int, limit=-1, kv: KV = None):
         async with aclosing(self.following_raw(uid, limit=limit, kv=kv)) as gen:
             async for rep in gen:
-                for x in parse_users(rep.json(), limit):
+                for x in parse_users(rep_json(rep), limit):
                     yield x
 
     # subscriptions
@@ -339,7 +339,7 @@ class API:
     async def subscriptions(self, uid: int, limit=-1, kv: KV = None):
         async with aclosing(self.subscriptions_raw(uid, limit=limit, kv=kv)) as gen:
             async for rep in gen:
-                for x in parse_users(rep.json(), limit):
+                for x in parse_users(rep_json(rep), limit):
                     yield x
 
     # retweeters
@@ -354,7 +354,7 @@ class API:
     async def retweeters(self, twid: int, limit=-1, kv: KV = None):
         async with aclosing(self.retweeters_raw(twid, limit=limit, kv=kv)) as gen:
             async for rep in gen:
-                for x in parse_users(rep.json(), limit):
+                for x in parse_users(rep_json(rep), limit):
                     yield x
 
     # user_tweets
@@ -377,7 +377,7 @@ class API:
     async def user_tweets(self, uid: int, limit=-1, kv: KV = None):
         async with aclosing(self.user_tweets_raw(uid, limit=limit, kv=kv)) as gen:
             async for rep in gen:
-                for x in parse_tweets(rep.json(), limit):
+                for x in parse_tweets(rep_json(rep), limit):
                     yield x
 
     # user_tweets_and_replies
@@ -400,7 +400,7 @@ class API:
     async def user_tweets_and_replies(self, uid: int, limit=-1, kv: KV = None):
         async with aclosing(self.user_tweets_and_replies_raw(uid, limit=limit, kv=kv)) as gen:
             async for rep in gen:
-                for x in parse_tweets(rep.json(), limit):
+                for x in parse_tweets(rep_json(rep), limit):
                     yield x
 
     # user_media
@@ -486,7 +486,7 @@ class API:
         }
         async with aclosing(self.search_raw(q, limit=limit, kv=kv)) as gen:
             async for rep in gen:
-                for x in parse_tweets(rep.json(), limit):
+                for x in parse_tweets(rep_json(rep), limit):
                     yield x
 
     # Get current user bookmarks
@@ -512,5 +512,5 @@ class API:
     async def bookmarks(self, limit=-1, kv: KV = None):
         async with aclosing(self.bookmarks_raw(limit=limit, kv=kv)) as gen:
             async for rep in gen:
-                for x in parse_tweets(rep.json(), limit):
+                for x in parse_tweets(rep_json(rep), limit):
                     yield x
@@ -13,7 +13,7 @@ from typing import Generator, Optional, Union
 import httpx
 
 from .logger import logger
-from .utils import find_item, get_or, int_or, to_old_rep, utc
+from .utils import find_item, get_or, int_or, rep_json, to_old_rep, utc
 
 
 @dataclass
@@ -708,7 +708,7 @@ def _parse_items(rep: httpx.Response, kind: str, limit: int = -1):
         raise ValueError(f"Invalid kind: {kind}")
 
     # check for dict, because httpx.Response can be mocked in tests with different type
-    res = rep if isinstance(rep, dict) else rep.json()
+    res = rep if isinstance(rep, dict) else rep_json(rep)
     obj = to_old_rep(res)
 
     ids = set()
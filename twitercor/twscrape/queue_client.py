@@ -9,7 +9,7 @@ from httpx import AsyncClient, Response
 
 from .accounts_pool import Account, AccountsPool
 from .logger import logger
-from .utils import utc
+from .utils import rep_json, utc
 from .xclid import XClIdGen
 
 ReqParams = dict[str, str | int] | None
@@ -168,7 +168,7 @@ class QueueClient:
             dump_rep(rep)
 
         try:
-            res = rep.json()
+            res = rep_json(rep)
         except json.JSONDecodeError:
             res: Any = {"_raw": rep.text}
 
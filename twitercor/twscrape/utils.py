@@ -5,6 +5,11 @@ from collections import defaultdict
 from datetime import datetime, timezone
 from typing import Any, AsyncGenerator, Callable, TypeVar
 
+try:
+    import orjson
+except ImportError:  # optional, stdlib json is the fallback
+    orjson = None
+
 T = TypeVar("T")
 
 
@@ -22,6 +27,15 @@ class utc:
         return int(utc.now().timestamp())
 
 
+def rep_json(rep) -> Any:
+    # parsed once per response: _check_rep and the parsers both read the body
+    obj = getattr(rep, "_twscrape_json", None)
+    if obj is None:
+        obj = orjson.loads(rep.content) if orjson is not None else rep.json()
+        rep._twscrape_json = obj
+    return obj
+
+
 async def gather(gen: AsyncGenerator[T, None]) -> list[T]:
     items = []
     async for x in gen: